@@ -2,6 +2,7 @@ from fastapi import Request
 from google.cloud import bigquery
 
 from app.config.settings import PROJECT_ID
+from app.metrics import BIGQUERY_BYTES_BILLED, BIGQUERY_BYTES_PROCESSED
 
 
 def init_bigquery_client():
@@ -19,3 +20,17 @@ def init_bigquery_client():
 
 def get_bigquery_client(request: Request) -> bigquery.Client:
     return request.app.state.bigquery_client
+
+
+def observe_query_job(job: bigquery.QueryJob, operation: str):
+    """
+    Record the bytes processed and billed by a finished (or dry-run) query job.
+
+    Args:
+        job (bigquery.QueryJob): The query job.
+        operation (str): The operation label, e.g. "query" or "dry_run".
+    """
+    if job.total_bytes_processed is not None:
+        BIGQUERY_BYTES_PROCESSED.observe(job.total_bytes_processed, operation)
+    if not job.dry_run and job.total_bytes_billed is not None:
+        BIGQUERY_BYTES_BILLED.observe(job.total_bytes_billed, operation)
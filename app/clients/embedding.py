@@ -1,13 +1,293 @@
-from fastapi import Request
-from sentence_transformers import SentenceTransformer
+import json
+import logging
+import socket
+import struct
+import threading
+import time
+from pathlib import Path
 
-from app.config.settings import EMBEDDING_MODEL, EMBEDDING_MODEL_PROVIDER
+import numpy as np
+from fastapi import HTTPException, Request
+
+from app.config.settings import (
+    EMBEDDING_MODEL,
+    EMBEDDING_MODEL_PROVIDER,
+    EMBEDDING_ONNX_QUANTIZE,
+    EMBEDDING_READY_TIMEOUT,
+    EMBEDDING_SERVER_CONNECT_TIMEOUT,
+    EMBEDDING_SERVER_REQUEST_TIMEOUT,
+    EMBEDDING_SERVER_SOCKET,
+    EMBEDDING_WARMUP_BATCH_SIZE,
+)
+from app.metrics import EMBEDDING_BATCH_SIZE, EMBEDDING_INFERENCE_DURATION
+from app.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBackend:
+    """
+    Base class for embedding backends.
+
+    Backends are registered by provider name with `register_backend` and selected with
+    EMBEDDING_MODEL_PROVIDER. Backends with `needs_warmup = False` are not run on a dummy batch
+    after loading.
+    """
+
+    needs_warmup = True
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def encode(self, texts: list[str]) -> list[list[float]]:
+        raise NotImplementedError
+
+
+EMBEDDING_BACKENDS: dict[str, type[EmbeddingBackend]] = {}
+
+
+def register_backend(provider: str):
+    """
+    Register an embedding backend class under the given provider name.
+    """
+
+    def decorator(backend_cls: type[EmbeddingBackend]) -> type[EmbeddingBackend]:
+        EMBEDDING_BACKENDS[provider] = backend_cls
+        return backend_cls
+
+    return decorator
+
+
+@register_backend("sentence-transformers")
+class SentenceTransformersBackend(EmbeddingBackend):
+    """
+    PyTorch backend using sentence-transformers.
+    """
+
+    def __init__(self, model_name: str):
+        super().__init__(model_name)
+        # Imported here because importing sentence_transformers (and torch) takes several seconds
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: list[str]) -> list[list[float]]:
+        return self.model.encode(texts).tolist()
+
+
+@register_backend("onnx")
+class OnnxBackend(EmbeddingBackend):
+    """
+    ONNX Runtime backend for CPU inference, optionally with dynamic int8 quantization.
+
+    `model_name` must be a local sentence-transformers model directory. On first use the model is
+    exported to `<model_dir>/onnx/model.onnx` (this step needs torch and transformers) and, when
+    EMBEDDING_ONNX_QUANTIZE is enabled, quantized to `<model_dir>/onnx/model_qint8.onnx`. Both files
+    are reused afterwards, so serving only needs onnxruntime and tokenizers and never hits the network.
+    """
+
+    def __init__(self, model_name: str, quantize: bool = EMBEDDING_ONNX_QUANTIZE):
+        super().__init__(model_name)
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_name)
+        if not model_dir.is_dir():
+            raise ValueError(f"ONNX embedding backend requires a local model directory, got: {model_name}")
+
+        onnx_path = model_dir / "onnx" / "model.onnx"
+        if not onnx_path.exists():
+            export_onnx_model(model_dir, onnx_path)
+        if quantize:
+            quantized_path = onnx_path.with_name("model_qint8.onnx")
+            if not quantized_path.exists():
+                quantize_onnx_model(onnx_path, quantized_path)
+            onnx_path = quantized_path
+
+        self.max_seq_length, self.pooling_mode, self.normalize = _read_sentence_transformers_config(model_dir)
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding()
+
+        self.session = ort.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def encode(self, texts: list[str]) -> list[list[float]]:
+        encodings = self.tokenizer.encode_batch(texts)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        inputs = {
+            "input_ids": np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+            "attention_mask": attention_mask,
+            "token_type_ids": np.array([encoding.type_ids for encoding in encodings], dtype=np.int64),
+        }
+        token_embeddings = self.session.run(None, {k: v for k, v in inputs.items() if k in self.input_names})[0]
+
+        if self.pooling_mode == "cls":
+            embeddings = token_embeddings[:, 0]
+        else:
+            mask = attention_mask[..., None].astype(token_embeddings.dtype)
+            embeddings = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.normalize:
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings.astype(np.float32).tolist()
+
+
+# Embedding server protocol: a request is the byte length of a JSON array of texts followed by the
+# array; a response is (rows, dimension) followed by rows * dimension float32 values, or
+# (-1, message length) followed by a UTF-8 error message.
+REQUEST_HEADER = struct.Struct("<I")
+RESPONSE_HEADER = struct.Struct("<iI")
+
+
+def recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            raise ConnectionError("Embedding server closed the connection")
+        received += count
+    return bytes(buffer)
+
+
+@register_backend("remote")
+class RemoteEmbeddingBackend(EmbeddingBackend):
+    """
+    Client of the shared embedding server (`python -m app.embedding_server`) over a Unix socket.
+
+    The server holds the only copy of the model, so worker processes do not load it. `model_name`
+    is ignored; the server's model is used. Each thread connects on its first request and keeps
+    its connection, waiting up to `connect_timeout` seconds for the server socket (the server binds
+    it once its model is loaded), so a worker started before the server recovers once it is up.
+    A request that gets no answer within `request_timeout` seconds fails and drops its connection.
+    """
+
+    # The server warms up its own model
+    needs_warmup = False
+
+    def __init__(
+        self,
+        model_name: str,
+        socket_path: str = EMBEDDING_SERVER_SOCKET,
+        connect_timeout: float = EMBEDDING_SERVER_CONNECT_TIMEOUT,
+        request_timeout: float = EMBEDDING_SERVER_REQUEST_TIMEOUT,
+    ):
+        super().__init__(model_name)
+        self.socket_path = socket_path
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            return sock
+
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.request_timeout)
+            try:
+                sock.connect(self.socket_path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                if time.monotonic() >= deadline:
+                    raise ConnectionError(f"Embedding server is not available at {self.socket_path}")
+                time.sleep(0.2)
+        self._local.sock = sock
+        return sock
+
+    def encode(self, texts: list[str]) -> list[list[float]]:
+        sock = self._connection()
+        request = json.dumps(texts, ensure_ascii=False).encode()
+        try:
+            sock.sendall(REQUEST_HEADER.pack(len(request)) + request)
+            rows, size = RESPONSE_HEADER.unpack(recv_exactly(sock, RESPONSE_HEADER.size))
+            if rows < 0:
+                raise RuntimeError(f"Embedding server error: {recv_exactly(sock, size).decode()}")
+            vectors = np.frombuffer(recv_exactly(sock, rows * size * 4), dtype=np.float32)
+        except OSError as e:
+            # Reconnect on the next call, e.g. after the server restarted. After a timeout, the late
+            # response must not be read as the answer to the next request.
+            sock.close()
+            self._local.sock = None
+            if isinstance(e, TimeoutError):
+                raise TimeoutError(f"Embedding server did not respond within {self.request_timeout}s") from e
+            raise
+        return vectors.reshape(rows, size).tolist()
+
+
+def _read_sentence_transformers_config(model_dir: Path) -> tuple[int, str, bool]:
+    """
+    Read max sequence length, pooling mode and normalization from a sentence-transformers model directory.
+    """
+    max_seq_length = 256
+    config_path = model_dir / "sentence_bert_config.json"
+    if config_path.exists():
+        max_seq_length = json.loads(config_path.read_text()).get("max_seq_length", max_seq_length)
+
+    pooling_mode = "mean"
+    pooling_config_path = model_dir / "1_Pooling" / "config.json"
+    if pooling_config_path.exists() and json.loads(pooling_config_path.read_text()).get("pooling_mode_cls_token"):
+        pooling_mode = "cls"
+
+    normalize = False
+    modules_path = model_dir / "modules.json"
+    if modules_path.exists():
+        normalize = any(module["type"].endswith("Normalize") for module in json.loads(modules_path.read_text()))
+
+    return max_seq_length, pooling_mode, normalize
+
+
+def export_onnx_model(model_dir: Path, output_path: Path):
+    """
+    Export the transformer of a local model directory to ONNX, without network access.
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    logger.info("Exporting '%s' to ONNX at '%s'", model_dir, output_path)
+    tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+    model = AutoModel.from_pretrained(model_dir, local_files_only=True).eval()
+    dummy = tokenizer(["warmup"], return_tensors="pt")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (dummy["input_ids"], dummy["attention_mask"]),
+            str(output_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=17,
+        )
+
+
+def quantize_onnx_model(input_path: Path, output_path: Path):
+    """
+    Apply dynamic int8 quantization to the weights of an ONNX model.
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    logger.info("Quantizing '%s' to int8 at '%s'", input_path, output_path)
+    quantize_dynamic(str(input_path), str(output_path), weight_type=QuantType.QInt8)
 
 
 class EmbeddingClient:
     """
-    EmbeddingClient is a wrapper around the SentenceTransformer model.
+    EmbeddingClient is a wrapper around an embedding backend selected by model provider.
     It provides methods to initialize the model and get embeddings for text.
+
+    The model can be loaded in a background thread with `start_loading`, so the application
+    can serve requests that do not need embeddings while the model is still loading.
     """
 
     def __init__(
@@ -17,28 +297,88 @@ class EmbeddingClient:
     ):
         self.model_name = model_name
         self.model_provider = model_provider
+        self.status = "pending"  # pending -> loading -> ready | failed
+        self.error: str | None = None
+        self._ready = threading.Event()
+        self._thread: threading.Thread | None = None
 
     def build_model(self):
         """
         Build the embedding model.
         """
-        if self.model_provider == "sentence-transformers":
-            self.model = SentenceTransformer(self.model_name)
-        else:
+        backend_cls = EMBEDDING_BACKENDS.get(self.model_provider)
+        if backend_cls is None:
             raise ValueError(f"Unsupported embedding model provider: {self.model_provider}")
+        self.model = backend_cls(self.model_name)
+
+    def warmup(self, batch_size: int = EMBEDDING_WARMUP_BATCH_SIZE):
+        """
+        Run a dummy batch through the model so the first real request does not pay for lazy initialization.
+        """
+        if batch_size > 0 and self.model.needs_warmup:
+            self.model.encode(["warmup"] * batch_size)
+
+    def load(self):
+        """
+        Build and warm up the model, recording the outcome in `status`.
+        """
+        self.status = "loading"
+        try:
+            self.build_model()
+            self.warmup()
+            self.status = "ready"
+            logger.info("Embedding model '%s' is ready", self.model_name)
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            logger.exception("Failed to load embedding model '%s'", self.model_name)
+        finally:
+            self._ready.set()
+
+    def start_loading(self):
+        """
+        Load the model in a background thread.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.load, name="embedding-model-loader", daemon=True)
+            self._thread.start()
+
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        """
+        Block until the model finished loading or the timeout expires.
+
+        Returns:
+            bool: True if the model is ready to serve embeddings.
+        """
+        self._ready.wait(timeout)
+        return self.status == "ready"
 
     def embed(self, text: str) -> list[float]:
-        if self.model_provider == "sentence-transformers":
-            return self.model.encode(text).tolist()
-        else:
-            raise ValueError(f"Unsupported embedding model provider: {self.model_provider}")
+        EMBEDDING_BATCH_SIZE.observe(1, self.model_provider)
+        with span("embed"), EMBEDDING_INFERENCE_DURATION.time(self.model_provider):
+            return self.model.encode([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        EMBEDDING_BATCH_SIZE.observe(len(texts), self.model_provider)
+        with span("embed"), EMBEDDING_INFERENCE_DURATION.time(self.model_provider):
+            return self.model.encode(texts)
 
 
 def get_embedding_client(request: Request) -> EmbeddingClient:
     """
-    Get the embedding model from the request state.
+    Get the embedding client from the request state.
+
+    Waits up to EMBEDDING_READY_TIMEOUT seconds for a model that is still loading.
 
     Returns:
-        SentenceTransformer: The embedding model.
+        EmbeddingClient: The embedding client.
     """
-    return request.app.state.embedding_client
+    embedding_client = request.app.state.embedding_client
+    if not embedding_client.wait_until_ready(EMBEDDING_READY_TIMEOUT):
+        detail = f"Embedding model is not ready (status: {embedding_client.status})"
+        if embedding_client.error:
+            detail += f": {embedding_client.error}"
+        raise HTTPException(status_code=503, detail=detail)
+    return embedding_client
@@ -0,0 +1,119 @@
+import asyncio
+from collections.abc import Callable
+
+import httpx
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+from app.config.settings import (
+    APP_HOST,
+    APP_PORT,
+    MCP_BASE_URL,
+    MCP_MAX_CONNECTIONS,
+    MCP_TIMEOUT,
+    MCP_TOOL_TIMEOUTS,
+    MCP_TRANSPORT,
+)
+
+
+class ToolTimeoutTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper applying a per-operation timeout and a limit on concurrent tool calls.
+
+    The operation is resolved from the request method and path using the app's routes, so the
+    timeout of an MCP tool is configured by its operation_id. The timeout covers reading the
+    response body. The wrapped transport and the concurrency limit are created by `open`, which
+    the app's lifespan calls in its event loop.
+    """
+
+    def __init__(
+        self,
+        transport_factory: Callable[[], httpx.AsyncBaseTransport],
+        app: FastAPI,
+        timeouts: dict[str, float],
+        default_timeout: float,
+        max_concurrency: int,
+    ):
+        self._transport_factory = transport_factory
+        self._transport: httpx.AsyncBaseTransport | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._max_concurrency = max_concurrency
+        self._default_timeout = default_timeout
+        self._routes = [
+            (route.path_regex, route.methods, timeouts[route.operation_id])
+            for route in app.routes
+            if isinstance(route, APIRoute) and route.operation_id in timeouts
+        ]
+
+    def open(self):
+        self._transport = self._transport_factory()
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+    def _timeout_for(self, request: httpx.Request) -> float:
+        for path_regex, methods, timeout in self._routes:
+            if request.method in methods and path_regex.match(request.url.path):
+                return timeout
+        return self._default_timeout
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            raise RuntimeError("The MCP HTTP client was used before the app's lifespan opened its transport")
+        timeout = self._timeout_for(request)
+        async with self._semaphore:
+            try:
+                return await asyncio.wait_for(self._send(request), timeout)
+            except TimeoutError:
+                raise httpx.ReadTimeout(f"Tool call timed out after {timeout}s", request=request)
+
+    async def aclose(self):
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+
+
+def init_mcp_http_client(app: FastAPI) -> httpx.AsyncClient:
+    """
+    Initializes the HTTP client the MCP server uses to call the app's endpoints.
+
+    With MCP_TRANSPORT=asgi (default), tool calls are dispatched to the app in-process instead of
+    going over a loopback TCP connection. MCP_TRANSPORT=http calls MCP_BASE_URL
+    (default http://APP_HOST:APP_PORT), e.g. when the MCP bridge should go through a proxy.
+
+    The client's transport is stored as `app.state.mcp_transport`; the lifespan opens and closes it.
+
+    Returns:
+        httpx.AsyncClient: The HTTP client for the MCP server.
+    """
+    if MCP_TRANSPORT == "asgi":
+
+        def transport_factory() -> httpx.AsyncBaseTransport:
+            return httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+        base_url = "http://apiserver"
+    elif MCP_TRANSPORT == "http":
+        limits = httpx.Limits(max_connections=MCP_MAX_CONNECTIONS, max_keepalive_connections=MCP_MAX_CONNECTIONS)
+
+        def transport_factory() -> httpx.AsyncBaseTransport:
+            return httpx.AsyncHTTPTransport(limits=limits)
+
+        base_url = MCP_BASE_URL or f"http://{APP_HOST}:{APP_PORT}"
+    else:
+        raise ValueError(f"Unsupported MCP transport: {MCP_TRANSPORT}")
+
+    app.state.mcp_transport = ToolTimeoutTransport(
+        transport_factory, app, MCP_TOOL_TIMEOUTS, MCP_TIMEOUT, MCP_MAX_CONNECTIONS
+    )
+    # Timeouts are enforced per tool by ToolTimeoutTransport; the read timeout is a backstop for
+    # network reads in http mode
+    backstop = max([MCP_TIMEOUT, *MCP_TOOL_TIMEOUTS.values()])
+    return httpx.AsyncClient(
+        transport=app.state.mcp_transport, base_url=base_url, timeout=httpx.Timeout(None, read=backstop)
+    )
@@ -1,20 +1,92 @@
+import threading
+import time
+from typing import Any
+
 from fastapi import Request
 from qdrant_client import QdrantClient
 
-from app.config.settings import QDRANT_HOST, QDRANT_PORT
+from app.config.settings import QDRANT_COLLECTION_CACHE_TTL, QDRANT_HOST, QDRANT_PORT
+from app.metrics import CACHE_REQUESTS, QDRANT_REQUEST_DURATION
+from app.tracing import span
+
+
+class CollectionCache:
+    """
+    Short-lived cache for the collection listing.
+
+    Writes that change collections or their document counts call `invalidate`. A value computed
+    while an invalidation happened is discarded instead of being cached.
+    """
+
+    def __init__(self, name: str, ttl: float = QDRANT_COLLECTION_CACHE_TTL):
+        self.name = name
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._expires_at = 0.0
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self) -> Any:
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires_at:
+                CACHE_REQUESTS.inc(self.name, "hit")
+                return self._value
+        CACHE_REQUESTS.inc(self.name, "miss")
+        return None
+
+    def set(self, value: Any, generation: int):
+        with self._lock:
+            if generation == self._generation and self.ttl > 0:
+                self._value = value
+                self._expires_at = time.monotonic() + self.ttl
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._value = None
+
+
+collection_cache = CollectionCache("qdrant_collections")
+
+
+class InstrumentedQdrantClient:
+    """
+    Proxy around QdrantClient recording the latency of every call per operation (method name),
+    also as a tracing span of the current request.
+    """
+
+    def __init__(self, client: QdrantClient):
+        self._client = client
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+
+        def timed(*args, **kwargs):
+            with span(f"qdrant_{name}"), QDRANT_REQUEST_DURATION.time(name):
+                return attr(*args, **kwargs)
+
+        # Cache the wrapper so later lookups skip __getattr__
+        setattr(self, name, timed)
+        return timed
 
 
-def init_qdrant_client():
+def init_qdrant_client() -> InstrumentedQdrantClient:
     """
     Initializes the Qdrant client.
 
     Returns:
-        QdrantClient: The initialized Qdrant client.
+        InstrumentedQdrantClient: The initialized Qdrant client, instrumented with call latency metrics.
     """
-    return QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+    return InstrumentedQdrantClient(QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT))
 
 
-def get_qdrant_client(request: Request) -> QdrantClient:
+def get_qdrant_client(request: Request) -> QdrantClient | InstrumentedQdrantClient:
     """
     Get the Qdrant client from the request state.
 
@@ -22,6 +94,7 @@ def get_qdrant_client(request: Request) -> QdrantClient:
         request (Request): The FastAPI request object.
 
     Returns:
-        QdrantClient: The Qdrant client.
+        QdrantClient | InstrumentedQdrantClient: The Qdrant client, or the instrumented proxy around it
+        that init_qdrant_client creates.
     """
     return request.app.state.qdrant_client
@@ -0,0 +1,641 @@
+import fcntl
+import json
+import logging
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from fastapi import Request
+
+from app.config.settings import (
+    SEQUENTIAL_THINKING_MAX_SESSIONS,
+    SEQUENTIAL_THINKING_MAX_THOUGHTS_PER_SESSION,
+    SEQUENTIAL_THINKING_SESSION_TTL,
+    SEQUENTIAL_THINKING_STORE,
+    SEQUENTIAL_THINKING_STORE_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ThoughtRecord:
+    """
+    A stored thought.
+
+    `seq` only orders the thoughts of a session: a later thought has a larger value. Values are not
+    contiguous in every store (the SQLite store uses a table-wide counter), so code outside
+    ThoughtSession must only compare them.
+    """
+
+    id: str
+    thought: str
+    thought_number: int
+    total_thoughts: int
+    next_thought_needed: bool
+    is_revision: bool | None
+    revises_thought: int | None
+    branch_from_thought: int | None
+    branch_id: str | None
+    needs_more_thoughts: bool | None
+    timestamp: datetime
+    seq: int = 0
+
+
+RECORD_FIELDS = tuple(field.name for field in fields(ThoughtRecord) if field.name != "seq")
+
+
+class ThoughtSession:
+    """
+    Thoughts of a single session, indexed by ID, thought number and branch.
+
+    Holds at most `max_thoughts` thoughts; the oldest ones are dropped first.
+    """
+
+    __slots__ = ("thoughts", "by_id", "by_number", "branches", "next_seq", "max_thoughts", "last_access")
+
+    def __init__(self, max_thoughts: int):
+        self.thoughts: deque[ThoughtRecord] = deque()
+        self.by_id: dict[str, ThoughtRecord] = {}
+        self.by_number: dict[int, list[ThoughtRecord]] = {}
+        self.branches: dict[str, list[str]] = {}  # branch_id -> thought IDs
+        self.next_seq = 1
+        self.max_thoughts = max_thoughts
+        self.last_access = time.monotonic()
+
+    def add(self, record: ThoughtRecord):
+        record.seq = self.next_seq
+        self.next_seq += 1
+        self.thoughts.append(record)
+        self.by_id[record.id] = record
+        self.by_number.setdefault(record.thought_number, []).append(record)
+        if record.branch_id:
+            self.branches.setdefault(record.branch_id, []).append(record.id)
+
+        while len(self.thoughts) > self.max_thoughts:
+            self._drop_oldest()
+
+    def _drop_oldest(self):
+        # The oldest thought is also the first entry of its thought-number and branch lists
+        record = self.thoughts.popleft()
+        del self.by_id[record.id]
+        same_number = self.by_number[record.thought_number]
+        same_number.pop(0)
+        if not same_number:
+            del self.by_number[record.thought_number]
+        if record.branch_id:
+            branch = self.branches[record.branch_id]
+            branch.pop(0)
+            if not branch:
+                del self.branches[record.branch_id]
+
+    def history(
+        self, since_id: str | None = None, limit: int | None = None, thought_number: int | None = None
+    ) -> list[ThoughtRecord]:
+        if thought_number is not None:
+            records = self.by_number.get(thought_number, [])
+            if since_id is not None:
+                since_seq = self.by_id[since_id].seq
+                records = [record for record in records if record.seq > since_seq]
+            return records[:limit]
+
+        start = 0
+        if since_id is not None:
+            # ThoughtSession numbers its thoughts contiguously, so the position follows from the first stored seq
+            start = self.by_id[since_id].seq - self.thoughts[0].seq + 1
+        stop = len(self.thoughts) if limit is None else min(len(self.thoughts), start + limit)
+        return [self.thoughts[i] for i in range(start, stop)]
+
+
+class ThoughtStore:
+    """
+    Base class for sequential thinking stores.
+
+    Stores are selected with SEQUENTIAL_THINKING_STORE. Only the "sqlite" and "log" stores share
+    state between processes, which is required when running with more than one worker.
+    """
+
+    def add_thought(self, session_id: str, record: ThoughtRecord) -> tuple[list[str], int]:
+        """
+        Store a thought.
+
+        Returns:
+            tuple: The branch IDs and the number of thoughts stored in the session.
+        """
+        raise NotImplementedError
+
+    def get_history(
+        self,
+        session_id: str,
+        since_id: str | None = None,
+        limit: int | None = None,
+        thought_number: int | None = None,
+    ) -> list[ThoughtRecord]:
+        """
+        Get thoughts in the order they were added, optionally only those added after `since_id`
+        or with the given thought number.
+
+        Raises:
+            KeyError: If `since_id` is not a stored thought of the session.
+        """
+        raise NotImplementedError
+
+    def get_branch(self, session_id: str, branch_id: str) -> list[str] | None:
+        """
+        Get the IDs of the thoughts in a branch, or None if the branch does not exist.
+        """
+        raise NotImplementedError
+
+    def get_metadata(self, session_id: str) -> dict:
+        """
+        Get the number of thoughts and branches in the session.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class InMemoryThoughtStore(ThoughtStore):
+    """
+    In-memory sequential thinking store with one ThoughtSession per session ID.
+
+    State is local to the process, so this store only works with a single worker.
+
+    Sessions idle for longer than `session_ttl` seconds are evicted, and at most `max_sessions`
+    are kept, evicting the least recently used session first.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = SEQUENTIAL_THINKING_MAX_SESSIONS,
+        session_ttl: float = SEQUENTIAL_THINKING_SESSION_TTL,
+        max_thoughts_per_session: int = SEQUENTIAL_THINKING_MAX_THOUGHTS_PER_SESSION,
+    ):
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self.max_thoughts_per_session = max_thoughts_per_session
+        self._sessions: OrderedDict[str, ThoughtSession] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict_expired(self, now: float):
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_access <= self.session_ttl:
+                break
+            self._sessions.popitem(last=False)
+
+    def _get_session(self, session_id: str, create: bool = False) -> ThoughtSession | None:
+        now = time.monotonic()
+        self._evict_expired(now)
+        session = self._sessions.get(session_id)
+        if session is None:
+            if not create:
+                return None
+            session = ThoughtSession(self.max_thoughts_per_session)
+            self._sessions[session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_access = now
+        return session
+
+    def add_thought(self, session_id: str, record: ThoughtRecord) -> tuple[list[str], int]:
+        with self._lock:
+            session = self._get_session(session_id, create=True)
+            session.add(record)
+            return list(session.branches), len(session.thoughts)
+
+    def get_history(
+        self,
+        session_id: str,
+        since_id: str | None = None,
+        limit: int | None = None,
+        thought_number: int | None = None,
+    ) -> list[ThoughtRecord]:
+        with self._lock:
+            session = self._get_session(session_id)
+            if session is None:
+                if since_id is not None:
+                    raise KeyError(since_id)
+                return []
+            return session.history(since_id, limit, thought_number)
+
+    def get_branch(self, session_id: str, branch_id: str) -> list[str] | None:
+        with self._lock:
+            session = self._get_session(session_id)
+            if session is None or branch_id not in session.branches:
+                return None
+            return list(session.branches[branch_id])
+
+    def iter_sessions(self) -> Iterator[tuple[str, ThoughtSession]]:
+        return iter(list(self._sessions.items()))
+
+    def thought_count(self) -> int:
+        return sum(len(session.thoughts) for session in self._sessions.values())
+
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+    def get_metadata(self, session_id: str) -> dict:
+        with self._lock:
+            session = self._get_session(session_id)
+            if session is None:
+                return {"total_thoughts": 0, "total_branches": 0, "branches": []}
+            return {
+                "total_thoughts": len(session.thoughts),
+                "total_branches": len(session.branches),
+                "branches": [
+                    {"id": b_id, "thought_count": len(thoughts)} for b_id, thoughts in session.branches.items()
+                ],
+            }
+
+
+def _encode_record(session_id: str, record: ThoughtRecord) -> dict:
+    entry = {"session_id": session_id}
+    for name in RECORD_FIELDS:
+        entry[name] = getattr(record, name)
+    entry["timestamp"] = record.timestamp.isoformat()
+    return entry
+
+
+def _decode_record(entry: dict) -> ThoughtRecord:
+    return ThoughtRecord(**{**entry, "timestamp": datetime.fromisoformat(entry["timestamp"])})
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    last_write REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_last_write ON sessions (last_write);
+CREATE TABLE IF NOT EXISTS thoughts (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL REFERENCES sessions (session_id) ON DELETE CASCADE,
+    id TEXT NOT NULL UNIQUE,
+    thought TEXT NOT NULL,
+    thought_number INTEGER NOT NULL,
+    total_thoughts INTEGER NOT NULL,
+    next_thought_needed INTEGER NOT NULL,
+    is_revision INTEGER,
+    revises_thought INTEGER,
+    branch_from_thought INTEGER,
+    branch_id TEXT,
+    needs_more_thoughts INTEGER,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS thoughts_session ON thoughts (session_id, seq);
+CREATE INDEX IF NOT EXISTS thoughts_session_number ON thoughts (session_id, thought_number, seq);
+CREATE INDEX IF NOT EXISTS thoughts_session_branch ON thoughts (session_id, branch_id, seq);
+"""
+
+
+class SQLiteThoughtStore(ThoughtStore):
+    """
+    SQLite store in WAL mode, shared by all worker processes on the same host.
+
+    Sessions without new thoughts for `session_ttl` seconds are deleted, and when a session is
+    created, the least recently written sessions beyond `max_sessions` are deleted.
+    """
+
+    # Seconds between sweeps for expired sessions
+    EXPIRY_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        path: str,
+        max_sessions: int = SEQUENTIAL_THINKING_MAX_SESSIONS,
+        session_ttl: float = SEQUENTIAL_THINKING_SESSION_TTL,
+        max_thoughts_per_session: int = SEQUENTIAL_THINKING_MAX_THOUGHTS_PER_SESSION,
+    ):
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self.max_thoughts_per_session = max_thoughts_per_session
+        self._next_expiry = 0.0
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SQLITE_SCHEMA)
+
+    @contextmanager
+    def _write_transaction(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _to_record(row: tuple) -> ThoughtRecord:
+        entry = dict(zip(RECORD_FIELDS, row[:-1], strict=True))
+        for name in ("next_thought_needed", "is_revision", "needs_more_thoughts"):
+            if entry[name] is not None:
+                entry[name] = bool(entry[name])
+        return ThoughtRecord(**{**entry, "timestamp": datetime.fromisoformat(entry["timestamp"]), "seq": row[-1]})
+
+    def add_thought(self, session_id: str, record: ThoughtRecord) -> tuple[list[str], int]:
+        now = time.time()
+        entry = _encode_record(session_id, record)
+        with self._lock, self._write_transaction() as conn:
+            if now >= self._next_expiry:
+                conn.execute("DELETE FROM sessions WHERE last_write < ?", (now - self.session_ttl,))
+                self._next_expiry = now + self.EXPIRY_INTERVAL
+
+            updated = conn.execute("UPDATE sessions SET last_write = ? WHERE session_id = ?", (now, session_id))
+            if updated.rowcount == 0:
+                conn.execute("INSERT INTO sessions (session_id, last_write) VALUES (?, ?)", (session_id, now))
+                conn.execute(
+                    "DELETE FROM sessions WHERE session_id IN "
+                    "(SELECT session_id FROM sessions ORDER BY last_write DESC LIMIT -1 OFFSET ?)",
+                    (self.max_sessions,),
+                )
+
+            conn.execute(
+                f"INSERT INTO thoughts (session_id, {', '.join(RECORD_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' * len(RECORD_FIELDS))})",
+                [entry[name] for name in ("session_id", *RECORD_FIELDS)],
+            )
+            conn.execute(
+                "DELETE FROM thoughts WHERE session_id = ? AND seq <= "
+                "(SELECT seq FROM thoughts WHERE session_id = ? ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+                (session_id, session_id, self.max_thoughts_per_session),
+            )
+
+            branches = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT branch_id FROM thoughts WHERE session_id = ? AND branch_id IS NOT NULL "
+                    "GROUP BY branch_id ORDER BY MIN(seq)",
+                    (session_id,),
+                )
+            ]
+            (count,) = conn.execute("SELECT COUNT(*) FROM thoughts WHERE session_id = ?", (session_id,)).fetchone()
+            return branches, count
+
+    def get_history(
+        self,
+        session_id: str,
+        since_id: str | None = None,
+        limit: int | None = None,
+        thought_number: int | None = None,
+    ) -> list[ThoughtRecord]:
+        query = f"SELECT {', '.join(RECORD_FIELDS)}, seq FROM thoughts WHERE session_id = ?"
+        params: list = [session_id]
+        with self._lock:
+            if since_id is not None:
+                row = self._conn.execute(
+                    "SELECT seq FROM thoughts WHERE session_id = ? AND id = ?", (session_id, since_id)
+                ).fetchone()
+                if row is None:
+                    raise KeyError(since_id)
+                query += " AND seq > ?"
+                params.append(row[0])
+            if thought_number is not None:
+                query += " AND thought_number = ?"
+                params.append(thought_number)
+            query += " ORDER BY seq LIMIT ?"
+            params.append(-1 if limit is None else limit)
+            return [self._to_record(row) for row in self._conn.execute(query, params)]
+
+    def get_branch(self, session_id: str, branch_id: str) -> list[str] | None:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM thoughts WHERE session_id = ? AND branch_id = ? ORDER BY seq", (session_id, branch_id)
+            ).fetchall()
+        return [row[0] for row in rows] or None
+
+    def get_metadata(self, session_id: str) -> dict:
+        with self._lock:
+            (total,) = self._conn.execute(
+                "SELECT COUNT(*) FROM thoughts WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            branches = self._conn.execute(
+                "SELECT branch_id, COUNT(*) FROM thoughts WHERE session_id = ? AND branch_id IS NOT NULL "
+                "GROUP BY branch_id ORDER BY MIN(seq)",
+                (session_id,),
+            ).fetchall()
+        return {
+            "total_thoughts": total,
+            "total_branches": len(branches),
+            "branches": [{"id": b_id, "thought_count": count} for b_id, count in branches],
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class LogThoughtStore(ThoughtStore):
+    """
+    Append-only log file store, shared by all worker processes on the same host.
+
+    Every process keeps an in-memory replica and replays new log entries before each operation.
+    Appends and compaction are serialized with an exclusive lock on `<path>.lock`.
+
+    The log is compacted when it holds twice as many entries as live thoughts, when it holds more
+    than `max_sessions` sessions, or when a session has had no new thoughts for `session_ttl` seconds
+    (checked every EXPIRY_INTERVAL seconds). Compaction drops thoughts beyond the per-session limit and
+    expired sessions, and when there are too many sessions, the least recently written ones down to
+    90% of `max_sessions`, so that the log is not rewritten for every new session. The compacted log
+    atomically replaces the old one, and other processes replay it on their next operation.
+    """
+
+    # Seconds between checks for expired sessions
+    EXPIRY_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        path: str,
+        max_sessions: int = SEQUENTIAL_THINKING_MAX_SESSIONS,
+        session_ttl: float = SEQUENTIAL_THINKING_SESSION_TTL,
+        max_thoughts_per_session: int = SEQUENTIAL_THINKING_MAX_THOUGHTS_PER_SESSION,
+        compact_min_entries: int = 10000,
+    ):
+        self.path = Path(path)
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self.max_thoughts_per_session = max_thoughts_per_session
+        self.compact_min_entries = compact_min_entries
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+        self._lock = threading.Lock()
+        self._next_expiry = 0.0
+        self._reset(inode=None)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._file_lock():
+            self._catch_up()
+            self._maybe_compact()
+
+    def _reset(self, inode: int | None):
+        # Eviction is only applied by compaction, so that every replica holds the same thoughts
+        self._replica = InMemoryThoughtStore(
+            max_sessions=sys.maxsize, session_ttl=math.inf, max_thoughts_per_session=self.max_thoughts_per_session
+        )
+        self._inode = inode
+        self._offset = 0
+        self._entries = 0
+        self._compact_at = self.compact_min_entries
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _catch_up(self):
+        """Replay log entries written since the last call, or the whole log if it was replaced."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino == self._inode and stat.st_size == self._offset:
+            return
+
+        with open(self.path, "rb") as log_file:
+            inode = os.fstat(log_file.fileno()).st_ino
+            if inode != self._inode:
+                self._reset(inode)
+            log_file.seek(self._offset)
+            data = log_file.read()
+
+        # Only complete lines; a concurrent append may not be fully written yet
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            entry = json.loads(line)
+            self._replica.add_thought(entry.pop("session_id"), _decode_record(entry))
+            self._entries += 1
+        self._offset += end
+
+    def _has_expired_sessions(self) -> bool:
+        cutoff = datetime.now() - timedelta(seconds=self.session_ttl)
+        return any(
+            session.thoughts and session.thoughts[-1].timestamp < cutoff for _, session in self._replica.iter_sessions()
+        )
+
+    def _maybe_compact(self):
+        compact = self._replica.session_count() > self.max_sessions
+        log_checked = self._entries >= self._compact_at
+        if log_checked:
+            compact = compact or self._entries > 2 * self._replica.thought_count()
+        now = time.monotonic()
+        if now >= self._next_expiry:
+            self._next_expiry = now + self.EXPIRY_INTERVAL
+            compact = compact or self._has_expired_sessions()
+
+        if compact:
+            self._compact()
+        if compact or log_checked:
+            self._compact_at = 2 * max(self._entries, self.compact_min_entries)
+
+    def _compact(self):
+        cutoff = datetime.now() - timedelta(seconds=self.session_ttl)
+        sessions = [
+            (session_id, session)
+            for session_id, session in self._replica.iter_sessions()
+            if session.thoughts and session.thoughts[-1].timestamp >= cutoff
+        ]
+        if len(sessions) > self.max_sessions:
+            sessions.sort(key=lambda item: item[1].thoughts[-1].timestamp, reverse=True)
+            sessions = sessions[: self.max_sessions - self.max_sessions // 10]
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as log_file:
+            for session_id, session in sessions:
+                log_file.writelines(_encode_line(session_id, record) for record in session.thoughts)
+            log_file.flush()
+            os.fsync(log_file.fileno())
+        os.replace(tmp_path, self.path)
+        logger.info(
+            "Compacted sequential thinking log from %d to %d entries",
+            self._entries,
+            sum(len(session.thoughts) for _, session in sessions),
+        )
+
+        self._reset(inode=None)
+        self._catch_up()
+
+    def add_thought(self, session_id: str, record: ThoughtRecord) -> tuple[list[str], int]:
+        line = _encode_line(session_id, record)
+        with self._lock:
+            with self._file_lock():
+                with open(self.path, "ab") as log_file:
+                    log_file.write(line)
+                self._catch_up()
+                self._maybe_compact()
+            metadata = self._replica.get_metadata(session_id)
+        return [branch["id"] for branch in metadata["branches"]], metadata["total_thoughts"]
+
+    def get_history(
+        self,
+        session_id: str,
+        since_id: str | None = None,
+        limit: int | None = None,
+        thought_number: int | None = None,
+    ) -> list[ThoughtRecord]:
+        with self._lock:
+            self._catch_up()
+            return self._replica.get_history(session_id, since_id, limit, thought_number)
+
+    def get_branch(self, session_id: str, branch_id: str) -> list[str] | None:
+        with self._lock:
+            self._catch_up()
+            return self._replica.get_branch(session_id, branch_id)
+
+    def get_metadata(self, session_id: str) -> dict:
+        with self._lock:
+            self._catch_up()
+            return self._replica.get_metadata(session_id)
+
+
+def _encode_line(session_id: str, record: ThoughtRecord) -> bytes:
+    return (json.dumps(_encode_record(session_id, record), separators=(",", ":"), ensure_ascii=False) + "\n").encode()
+
+
+def init_thought_store() -> ThoughtStore:
+    """
+    Initializes the sequential thinking store.
+
+    Returns:
+        ThoughtStore: The initialized thought store.
+    """
+    if SEQUENTIAL_THINKING_STORE == "memory":
+        return InMemoryThoughtStore()
+    elif SEQUENTIAL_THINKING_STORE == "sqlite":
+        return SQLiteThoughtStore(SEQUENTIAL_THINKING_STORE_PATH or "data/sequential_thinking.sqlite3")
+    elif SEQUENTIAL_THINKING_STORE == "log":
+        return LogThoughtStore(SEQUENTIAL_THINKING_STORE_PATH or "data/sequential_thinking.log")
+    else:
+        raise ValueError(f"Unsupported sequential thinking store: {SEQUENTIAL_THINKING_STORE}")
+
+
+def get_thought_store(request: Request) -> ThoughtStore:
+    """
+    Get the sequential thinking store from the request state.
+
+    Args:
+        request (Request): The FastAPI request object.
+
+    Returns:
+        ThoughtStore: The thought store.
+    """
+    return request.app.state.thought_store
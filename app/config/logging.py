@@ -0,0 +1,112 @@
+import atexit
+import dataclasses
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime
+
+from app.config.settings import LOG_FORMAT, LOG_LEVEL, LOG_QUEUE_SIZE
+from app.metrics import LOG_RECORDS_DROPPED
+
+# Attributes every LogRecord has; anything else was passed with `extra=` and is logged as a field
+RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in vars(record).items() if key not in RESERVED_ATTRS and key != "pretty"}
+
+
+def _json_default(value):
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including fields passed with `extra=`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **_extra_fields(record),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=_json_default)
+
+
+class PrettyFormatter(logging.Formatter):
+    """
+    Human-readable format for local use.
+
+    A record can carry a `pretty` callable (passed with `extra=`) that renders it; it is only
+    called here, on the listener thread.
+    """
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        pretty = getattr(record, "pretty", None)
+        if callable(pretty):
+            return pretty()
+        return super().format(record)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread and never blocks.
+
+    The default QueueHandler formats the message in the calling thread; here the record is
+    enqueued as-is, so the request path only pays for creating the record. When the queue is
+    full (the output cannot keep up), records are dropped instead of blocking; drops are counted
+    in `dropped` and in the app_log_records_dropped_total metric.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def setup_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT):
+    """
+    Route the app's log records through a queue drained by a background thread.
+
+    Records are formatted as JSON lines, or with PrettyFormatter when log_format is "pretty".
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(PrettyFormatter() if log_format == "pretty" else JsonFormatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=False)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    app_logger = logging.getLogger("app")
+    app_logger.addHandler(DeferredQueueHandler(log_queue))
+    app_logger.setLevel(level.upper())
+    app_logger.propagate = False
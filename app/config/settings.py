@@ -21,10 +21,85 @@ ALLOWED_STATEMENTS: list[str] = ["SELECT"]
 # qdrant config
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+# Exact point counts are expensive on large collections, the approximate count is used by default
+QDRANT_EXACT_COUNT = os.getenv("QDRANT_EXACT_COUNT", "false").lower() == "true"
+# Seconds the collection listing is cached; create, delete and ingestion invalidate it
+QDRANT_COLLECTION_CACHE_TTL = float(os.getenv("QDRANT_COLLECTION_CACHE_TTL", "5"))
 EMBEDDING_MODEL_PROVIDER = os.getenv("EMBEDDING_MODEL_PROVIDER", "sentence-transformers")
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
 EMBEDDING_SIZE = int(os.getenv("EMBEDDING_SIZE", "384"))
+# Only used by the "onnx" provider, where EMBEDDING_MODEL must be a local model directory
+EMBEDDING_ONNX_QUANTIZE = os.getenv("EMBEDDING_ONNX_QUANTIZE", "true").lower() == "true"
+# Load the embedding model in a background thread so startup is not blocked on it
+EMBEDDING_LAZY_LOAD = os.getenv("EMBEDDING_LAZY_LOAD", "true").lower() == "true"
+EMBEDDING_WARMUP_BATCH_SIZE = int(os.getenv("EMBEDDING_WARMUP_BATCH_SIZE", "8"))
+# Seconds a request waits for a model that is still loading before returning 503
+EMBEDDING_READY_TIMEOUT = float(os.getenv("EMBEDDING_READY_TIMEOUT", "30"))
+# Shared embedding server (python -m app.embedding_server), used by workers with EMBEDDING_MODEL_PROVIDER=remote
+# The socket lives in the user's runtime dir ($XDG_RUNTIME_DIR), or else in the project's data dir, not in a
+# world-writable dir like /tmp where other users could bind it first
+EMBEDDING_SERVER_SOCKET = os.getenv(
+    "EMBEDDING_SERVER_SOCKET", os.path.join(os.getenv("XDG_RUNTIME_DIR") or "data", "embedding-server.sock")
+)
+# Backend the server loads EMBEDDING_MODEL with
+EMBEDDING_SERVER_PROVIDER = os.getenv("EMBEDDING_SERVER_PROVIDER", "sentence-transformers")
+# Texts encoded together when requests from several workers are batched
+EMBEDDING_SERVER_MAX_BATCH = int(os.getenv("EMBEDDING_SERVER_MAX_BATCH", "64"))
+# Seconds an embedding request waits for the server socket, e.g. while the server is loading the model
+EMBEDDING_SERVER_CONNECT_TIMEOUT = float(os.getenv("EMBEDDING_SERVER_CONNECT_TIMEOUT", "60"))
+# Seconds a worker waits for the server to answer an embedding request
+EMBEDDING_SERVER_REQUEST_TIMEOUT = float(os.getenv("EMBEDDING_SERVER_REQUEST_TIMEOUT", "30"))
+
+# sequential thinking config
+# "memory" (single worker only), or "sqlite" / "log" to share state between worker processes
+SEQUENTIAL_THINKING_STORE = os.getenv("SEQUENTIAL_THINKING_STORE", "memory")
+SEQUENTIAL_THINKING_STORE_PATH = os.getenv("SEQUENTIAL_THINKING_STORE_PATH", "")
+SEQUENTIAL_THINKING_MAX_SESSIONS = int(os.getenv("SEQUENTIAL_THINKING_MAX_SESSIONS", "1000"))
+# Seconds after which an idle session is evicted
+SEQUENTIAL_THINKING_SESSION_TTL = float(os.getenv("SEQUENTIAL_THINKING_SESSION_TTL", "3600"))
+SEQUENTIAL_THINKING_MAX_THOUGHTS_PER_SESSION = int(os.getenv("SEQUENTIAL_THINKING_MAX_THOUGHTS_PER_SESSION", "10000"))
+
+# logging config
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# "json" (one object per line, for containers) or "pretty" (human-readable, for local use)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Records waiting to be written; further records are dropped while the queue is full
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# health config
+# Seconds between background dependency probes; /health/ready only reads their cached results
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "15"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "5"))
+# Upper bound for the `timeout` parameter of /health/health
+HEALTH_MAX_WAIT = float(os.getenv("HEALTH_MAX_WAIT", "10"))
 
 # app config
 APP_HOST = os.getenv("APP_HOST", "127.0.0.1")
 APP_PORT = os.getenv("APP_PORT", "8000")
+
+# mcp config
+# "asgi" dispatches tool calls to the app in-process, "http" calls MCP_BASE_URL over the network
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "asgi")
+MCP_BASE_URL = os.getenv("MCP_BASE_URL", "")
+MCP_TIMEOUT = float(os.getenv("MCP_TIMEOUT", "60"))
+MCP_MAX_CONNECTIONS = int(os.getenv("MCP_MAX_CONNECTIONS", "100"))
+# Per-tool timeouts in seconds as comma-separated operation_id=seconds pairs, e.g. "add_documents=300"
+MCP_TOOL_TIMEOUTS: dict[str, float] = {
+    operation_id.strip(): float(timeout)
+    for operation_id, _, timeout in (
+        item.partition("=") for item in os.getenv("MCP_TOOL_TIMEOUTS", "").split(",") if item.strip()
+    )
+}
+
+# tracing and profiling config
+# Record spans of the traced stages and summarize them in a Server-Timing response header
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+# Allow profiling requests (X-Profile header and sampling) and serve profiles at /debug/profiles
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+# Fraction of requests profiled without the header when PROFILING_ENABLED is set (0 disables sampling)
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+# Seconds between stack samples
+PROFILING_INTERVAL = float(os.getenv("PROFILING_INTERVAL", "0.001"))
+PROFILING_DIR = os.getenv("PROFILING_DIR", "data/profiles")
+# Number of stored profiles kept; the oldest are deleted first
+PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", "100"))
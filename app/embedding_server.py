@@ -0,0 +1,166 @@
+"""
+Shared embedding server.
+
+Loads the embedding model once and serves the API worker processes over a Unix socket, so
+running N workers does not hold N copies of the model. Requests that arrive while the model is
+busy are encoded together in the next batch.
+
+Usage:
+    uv run python -m app.embedding_server &
+    EMBEDDING_MODEL_PROVIDER=remote uv run uvicorn app.main:app --workers 4
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from app.clients.embedding import REQUEST_HEADER, RESPONSE_HEADER, EmbeddingClient
+from app.config.logging import setup_logging
+from app.config.settings import (
+    EMBEDDING_MODEL,
+    EMBEDDING_SERVER_MAX_BATCH,
+    EMBEDDING_SERVER_PROVIDER,
+    EMBEDDING_SERVER_SOCKET,
+)
+
+logger = logging.getLogger("app.embedding_server")
+
+
+def _remove_stale_socket(socket_path: str):
+    """Remove the socket a previous server left behind, but never a file that is not a socket."""
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} exists and is not a socket")
+    os.unlink(socket_path)
+
+
+def _read_texts(payload: bytes) -> list[str]:
+    texts = json.loads(payload)
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        raise TypeError("Invalid request: expected a JSON list of strings")
+    return texts
+
+
+class EmbeddingServer:
+    def __init__(self, embedding_client: EmbeddingClient, max_batch: int = EMBEDDING_SERVER_MAX_BATCH):
+        self.embedding_client = embedding_client
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue[tuple[list[str], asyncio.Future]] = asyncio.Queue()
+        # A single inference thread; the backend parallelizes each batch itself
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-inference")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    (size,) = REQUEST_HEADER.unpack(await reader.readexactly(REQUEST_HEADER.size))
+                    payload = await reader.readexactly(size)
+                except asyncio.IncompleteReadError:
+                    break
+
+                try:
+                    texts = _read_texts(payload)
+                except (ValueError, TypeError) as e:
+                    # The payload was read in full, so the connection stays usable for the next request
+                    message = str(e).encode()
+                    writer.write(RESPONSE_HEADER.pack(-1, len(message)) + message)
+                    await writer.drain()
+                    continue
+
+                if not texts:
+                    writer.write(RESPONSE_HEADER.pack(0, 0))
+                    await writer.drain()
+                    continue
+
+                future = loop.create_future()
+                self._queue.put_nowait((texts, future))
+                try:
+                    vectors = await future
+                    writer.write(RESPONSE_HEADER.pack(*vectors.shape) + vectors.tobytes())
+                except Exception as e:
+                    message = str(e).encode()
+                    writer.write(RESPONSE_HEADER.pack(-1, len(message)) + message)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def run_batches(self):
+        """
+        Encode queued requests, batching the requests that queued up while the model was busy.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][0])
+            while not self._queue.empty() and size < self.max_batch:
+                batch.append(self._queue.get_nowait())
+                size += len(batch[-1][0])
+
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                vectors = await loop.run_in_executor(self._executor, self.embedding_client.embed_batch, texts)
+                vectors = np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+            except Exception as e:
+                logger.exception("Embedding batch of %d texts failed", len(texts))
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for request_texts, future in batch:
+                if not future.done():
+                    future.set_result(vectors[offset : offset + len(request_texts)])
+                offset += len(request_texts)
+
+    async def serve(self, socket_path: str):
+        Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+        _remove_stale_socket(socket_path)
+        server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+        logger.info("Embedding server listening on %s", socket_path)
+        try:
+            async with server:
+                await asyncio.gather(server.serve_forever(), self.run_batches())
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=EMBEDDING_MODEL)
+    parser.add_argument("--provider", default=EMBEDDING_SERVER_PROVIDER)
+    parser.add_argument("--socket", default=EMBEDDING_SERVER_SOCKET)
+    parser.add_argument("--max-batch", type=int, default=EMBEDDING_SERVER_MAX_BATCH)
+    args = parser.parse_args()
+
+    if args.provider == "remote":
+        parser.error("The embedding server needs a local provider, e.g. sentence-transformers or onnx")
+
+    setup_logging()
+    embedding_client = EmbeddingClient(args.model, args.provider)
+    # The socket is only bound once the model is loaded, so workers connecting to it wait for the model
+    embedding_client.load()
+    if embedding_client.status != "ready":
+        raise SystemExit(f"Failed to load embedding model: {embedding_client.error}")
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(EmbeddingServer(embedding_client, args.max_batch).serve(args.socket))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Background dependency probes for the readiness endpoint.
+
+BigQuery, Qdrant and the embedding model are probed concurrently every HEALTH_PROBE_INTERVAL
+seconds, each with its own timeout. /health/ready only reads the cached results, so polling it
+costs nothing and does not add load to the dependencies.
+"""
+
+import asyncio
+import contextlib
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from google.cloud import bigquery
+
+from app.config.settings import HEALTH_PROBE_INTERVAL, HEALTH_PROBE_TIMEOUT
+from app.metrics import DEPENDENCY_UP
+
+logger = logging.getLogger(__name__)
+
+
+def probe_bigquery(client: bigquery.Client) -> str:
+    # A dry run checks credentials and the jobs API without processing any bytes
+    client.query("SELECT 1", job_config=bigquery.QueryJobConfig(dry_run=True, use_query_cache=False))
+    return "ready"
+
+
+def probe_qdrant(client) -> str:
+    client.get_collections()
+    return "ready"
+
+
+def probe_embedding(client) -> str:
+    if client.status == "failed":
+        raise RuntimeError(client.error or "Embedding model failed to load")
+    if client.status != "ready":
+        return client.status
+    # Encode directly so probes are not counted in the embedding metrics
+    client.model.encode(["health check"])
+    return "ready"
+
+
+PROBES: dict[str, tuple[str, Callable[[Any], str]]] = {
+    "bigquery": ("bigquery_client", probe_bigquery),
+    "qdrant": ("qdrant_client", probe_qdrant),
+    "embedding": ("embedding_client", probe_embedding),
+}
+
+
+def _run_in_daemon_thread(probe: Callable[[Any], str], client: Any) -> asyncio.Future:
+    """
+    Run a probe in a daemon thread. Unlike the default executor, a hanging probe does not delay
+    the shutdown of the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(result: str | None, error: Exception | None):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run():
+        try:
+            result, error = probe(client), None
+        except Exception as e:
+            result, error = None, e
+        # The event loop may have been closed while the probe was running
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(resolve, result, error)
+
+    threading.Thread(target=run, name="health-probe", daemon=True).start()
+    return future
+
+
+class HealthMonitor:
+    """
+    Runs the dependency probes in the background and caches their results.
+
+    Probes run in threads with a timeout. A probe that is still hanging from a previous round is
+    not started again, so an unresponsive dependency does not pile up threads.
+    """
+
+    def __init__(self, state, interval: float = HEALTH_PROBE_INTERVAL, timeout: float = HEALTH_PROBE_TIMEOUT):
+        self._state = state
+        self.interval = interval
+        self.timeout = timeout
+        self.results: dict[str, dict[str, Any]] = {name: {"status": "pending"} for name in PROBES}
+        self._running: dict[str, asyncio.Future] = {}
+        self._task: asyncio.Task | None = None
+
+    async def _probe(self, name: str, client_attr: str, probe: Callable[[Any], str]):
+        client = getattr(self._state, client_attr, None)
+        if client is None:
+            return
+        previous = self._running.get(name)
+        if previous is not None and not previous.done():
+            return
+
+        start = time.perf_counter()
+        future = self._running[name] = _run_in_daemon_thread(probe, client)
+        # A probe that outlives its timeout finishes unobserved; retrieve its exception
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        try:
+            result = {"status": await asyncio.wait_for(asyncio.shield(future), self.timeout)}
+        except TimeoutError:
+            result = {"status": "failed", "error": f"Probe timed out after {self.timeout}s"}
+        except Exception as e:
+            result = {"status": "failed", "error": str(e)}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        result["checked_at"] = datetime.now(UTC).isoformat()
+
+        if result["status"] == "failed" and self.results[name].get("status") != "failed":
+            logger.warning("Health probe for %s failed: %s", name, result["error"])
+        self.results[name] = result
+        DEPENDENCY_UP.set(1.0 if result["status"] == "ready" else 0.0, name)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Returns:
+            dict: The cached probe result per dependency.
+        """
+        results = dict(self.results)
+        # The model's loading state is read live, so readiness flips as soon as loading finished
+        embedding_client = getattr(self._state, "embedding_client", None)
+        if embedding_client is not None and results["embedding"]["status"] in ("pending", "loading"):
+            results["embedding"] = {"status": embedding_client.status}
+        return results
+
+    async def check(self):
+        """
+        Probe all dependencies concurrently and update the cached results.
+        """
+        await asyncio.gather(*(self._probe(name, *probe) for name, probe in PROBES.items()))
+
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
@@ -1,16 +1,24 @@
 from contextlib import asynccontextmanager
 
-import httpx
 from fastapi import FastAPI
 from fastapi_mcp import FastApiMCP
 
 from app.clients.bigquery import init_bigquery_client
 from app.clients.embedding import EmbeddingClient
+from app.clients.mcp import init_mcp_http_client
 from app.clients.qdrant import init_qdrant_client
-from app.config.settings import APP_HOST, APP_PORT
-from app.routers import health, sequential_thinking
+from app.clients.thought_store import init_thought_store
+from app.config.logging import setup_logging
+from app.config.settings import APP_HOST, APP_PORT, EMBEDDING_LAZY_LOAD
+from app.health import HealthMonitor
+from app.metrics import MetricsMiddleware
+from app.responses import FastJSONResponse
+from app.routers import health, metrics, profiles, sequential_thinking
 from app.routers.bigquery import datasets, query, tables
-from app.routers.knowledge_base import collections, documents
+from app.routers.knowledge_base import collections, documents, transfer
+from app.tracing import TracingMiddleware
+
+setup_logging()
 
 
 @asynccontextmanager
@@ -18,9 +26,22 @@ async def lifespan(app: FastAPI):
     """Lifespan event handler for the FastAPI application."""
     app.state.bigquery_client = init_bigquery_client()
     app.state.qdrant_client = init_qdrant_client()
+    app.state.thought_store = init_thought_store()
     app.state.embedding_client = EmbeddingClient()
-    app.state.embedding_client.build_model()
+    if EMBEDDING_LAZY_LOAD:
+        app.state.embedding_client.start_loading()
+    else:
+        # Blocking startup fails fast instead of starting an app that can only answer 503
+        app.state.embedding_client.load()
+        if app.state.embedding_client.status == "failed":
+            raise RuntimeError(f"Embedding model failed to load: {app.state.embedding_client.error}")
+    app.state.health_monitor = HealthMonitor(app.state)
+    app.state.health_monitor.start()
+    app.state.mcp_transport.open()
     yield
+    await app.state.health_monitor.stop()
+    await app.state.mcp_transport.aclose()
+    app.state.thought_store.close()
 
 
 app = FastAPI(
@@ -28,16 +49,23 @@ app = FastAPI(
     description="FastAPI for MCP Servers",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+
 app.include_router(datasets.router, prefix="/bigquery", tags=["bigquery"])
 app.include_router(tables.router, prefix="/bigquery", tags=["bigquery"])
 app.include_router(query.router, prefix="/bigquery", tags=["bigquery"])
 app.include_router(collections.router, prefix="/knowledge-base", tags=["knowledge-base"])
 app.include_router(documents.router, prefix="/knowledge-base", tags=["knowledge-base"])
+app.include_router(transfer.router, prefix="/knowledge-base", tags=["knowledge-base-transfer"])
 app.include_router(sequential_thinking.router, prefix="/sequential-thinking", tags=["sequential-thinking"])
 
 app.include_router(health.router, prefix="/health", tags=["system"])
+app.include_router(metrics.router, tags=["system"])
+app.include_router(profiles.router, prefix="/debug", tags=["system"])
 
 
 @app.get("/")
@@ -48,13 +76,11 @@ async def root():
 mcp = FastApiMCP(
     app,  # Your FastAPI app
     name="Query FastAPI MCP",  # Name for the MCP server
-    http_client=httpx.AsyncClient(
-        timeout=60,
-        base_url=f"http://{APP_HOST}:{APP_PORT}",
-    ),  # HTTP client for the MCP server
+    http_client=init_mcp_http_client(app),  # HTTP client for the MCP server
     exclude_tags=[
         "system",
         "bigquery",
+        "knowledge-base-transfer",
     ],  # Exclude tags from the MCP server
 )
 mcp.mount()
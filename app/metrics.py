@@ -0,0 +1,199 @@
+"""
+Minimal Prometheus-style metrics.
+
+Metrics are kept in process memory and rendered in the Prometheus text exposition format by the
+/metrics endpoint. With several worker processes, each process reports its own values.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+BYTES_BUCKETS = tuple(float(2**power) for power in range(20, 42, 2))  # 1 MiB .. 2 TiB
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: tuple[str, ...], labels: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(labelnames, labels, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        return "\n".join(
+            [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}", *self.samples()]
+        )
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        # A metric without labels is reported as 0 before its first update
+        self._values: dict[tuple[str, ...], float] = {} if labelnames else {(): 0.0}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {value}" for labels, value in values]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        # labels -> [count per bucket (+Inf last), sum]
+        self._values: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, *labels: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+        samples = []
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts, strict=True):
+                cumulative += count
+                le = f'le="{bound}"'
+                samples.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            samples.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}")
+            samples.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return samples
+
+
+REGISTRY: list[Metric] = []
+
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+HTTP_REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being processed")
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route", "operation_id", "status"),
+)
+BIGQUERY_JOB_DURATION = Histogram(
+    "bigquery_job_duration_seconds", "Wall time of BigQuery calls by operation", ("operation",)
+)
+BIGQUERY_BYTES_PROCESSED = Histogram(
+    "bigquery_query_bytes_processed", "Bytes processed per BigQuery query", ("operation",), buckets=BYTES_BUCKETS
+)
+BIGQUERY_BYTES_BILLED = Histogram(
+    "bigquery_query_bytes_billed", "Bytes billed per BigQuery query", ("operation",), buckets=BYTES_BUCKETS
+)
+EMBEDDING_BATCH_SIZE = Histogram(
+    "embedding_batch_size", "Number of texts per embedding call", ("provider",), buckets=SIZE_BUCKETS
+)
+EMBEDDING_INFERENCE_DURATION = Histogram(
+    "embedding_inference_seconds", "Embedding inference time per call", ("provider",)
+)
+QDRANT_REQUEST_DURATION = Histogram(
+    "qdrant_request_duration_seconds", "Qdrant call latency by operation", ("operation",)
+)
+DEPENDENCY_UP = Gauge("dependency_up", "Result of the last background health probe (1 ready, 0 not)", ("dependency",))
+LOG_RECORDS_DROPPED = Counter("app_log_records_dropped_total", "Log records dropped because the logging queue was full")
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by cache and result (hit or miss)", ("cache", "result"))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording in-flight requests and request latency per route and operation_id.
+
+    Requests that did not match a route are recorded with route="unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # The router stores the matched route in the shared scope
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                getattr(route, "operation_id", None) or "",
+                str(status_code),
+            )
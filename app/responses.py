@@ -0,0 +1,47 @@
+import base64
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    # NUMERIC/BIGNUMERIC are kept exact, as Pydantic serializes Decimal
+    if isinstance(value, Decimal):
+        return str(value)
+    # BYTES are base64-encoded, as in the BigQuery REST API
+    if isinstance(value, bytes | bytearray | memoryview):
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, set | frozenset):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize to JSON with orjson.
+
+    datetime, date, time, UUID and numpy values are handled natively (UTC datetimes end in "Z",
+    as with Pydantic); Decimal, bytes and Pydantic models go through `_default`.
+    """
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Used as the app's default response class. Endpoints returning large payloads the server built
+    itself (query rows, search hits) return it directly with plain dicts, which skips the response
+    model validation and `jsonable_encoder` pass FastAPI otherwise runs on the returned value.
+    The route's `response_model` still documents the schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
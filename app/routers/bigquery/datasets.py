@@ -1,10 +1,15 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException
 from google.cloud import bigquery
 
 from app.clients.bigquery import get_bigquery_client
 from app.config.settings import ALLOWED_DATASETS
+from app.metrics import BIGQUERY_JOB_DURATION
 from app.schemas.bigquery import Dataset
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -16,8 +21,9 @@ def list_datasets(client: bigquery.Client = Depends(get_bigquery_client)):
     If ALLOWED_DATASETS is configured, only returns those datasets.
     """
     try:
-        datasets = list(client.list_datasets())
-        print(f"# datasets: {len(datasets)}")
+        with BIGQUERY_JOB_DURATION.time("list_datasets"):
+            datasets = list(client.list_datasets())
+        logger.debug("Listed %d datasets", len(datasets))
 
         if not datasets:
             return []
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from google.cloud import bigquery
 
-from app.clients.bigquery import get_bigquery_client
+from app.clients.bigquery import get_bigquery_client, observe_query_job
 from app.config.settings import ALLOWED_DATASETS, ALLOWED_STATEMENTS, MAX_BYTES_BILLED
+from app.metrics import BIGQUERY_JOB_DURATION
+from app.responses import FastJSONResponse
 from app.schemas.bigquery import QueryRequest, QueryResult, TableSchema
+from app.tracing import span
 
 router = APIRouter()
 
@@ -18,14 +21,16 @@ async def execute_query(query_request: QueryRequest, client: bigquery.Client = D
     """
     try:
         # Always run as dry_run first to validate
-        dry_run_job = client.query(
-            query_request.query,
-            job_config=bigquery.QueryJobConfig(
-                dry_run=True,
-                use_query_cache=False,
-                maximum_bytes_billed=MAX_BYTES_BILLED,
-            ),
-        )
+        with span("dry_run"), BIGQUERY_JOB_DURATION.time("dry_run"):
+            dry_run_job = client.query(
+                query_request.query,
+                job_config=bigquery.QueryJobConfig(
+                    dry_run=True,
+                    use_query_cache=False,
+                    maximum_bytes_billed=MAX_BYTES_BILLED,
+                ),
+            )
+        observe_query_job(dry_run_job, "dry_run")
 
         # Get statement type and validate if read-only
         statement_type = dry_run_job.statement_type
@@ -58,14 +63,14 @@ async def execute_query(query_request: QueryRequest, client: bigquery.Client = D
                 statement_type=statement_type,
             )
 
-        # If dry_run=False, run the actual query
-        query_job = client.query(
-            query_request.query,
-            job_config=bigquery.QueryJobConfig(maximum_bytes_billed=MAX_BYTES_BILLED),
-        )
-
-        # Wait for the query to complete
-        results = query_job.result()
+        # If dry_run=False, run the actual query and wait for it to complete
+        with span("query"), BIGQUERY_JOB_DURATION.time("query"):
+            query_job = client.query(
+                query_request.query,
+                job_config=bigquery.QueryJobConfig(maximum_bytes_billed=MAX_BYTES_BILLED),
+            )
+            results = query_job.result()
+        observe_query_job(query_job, "query")
 
         # Extract schema information
         schemas = []
@@ -74,20 +79,27 @@ async def execute_query(query_request: QueryRequest, client: bigquery.Client = D
                 TableSchema(name=field.name, type=field.field_type, mode=field.mode, description=field.description)
             )
 
-        # Convert results to dicts
-        rows = [dict(row.items()) for row in results]
+        # Convert results to dicts (result pages are downloaded while iterating). Row values are
+        # read by position, since Row.items() deep-copies every value.
+        field_names = [field.name for field in results.schema]
+        with span("fetch_rows"):
+            rows = [dict(zip(field_names, row, strict=True)) for row in results]
 
-        # Return formatted results
-        return QueryResult(
-            rows=rows,
-            total_rows=len(rows),
-            schemas=schemas,
-            bytes_processed=query_job.total_bytes_processed,
-            gbytes_processed=dry_run_job.total_bytes_processed / (1024 * 1024 * 1024),
-            job_id=query_job.job_id,
-            referenced_tables=[f"{t.project}.{t.dataset_id}.{t.table_id}" for t in referenced_tables],
-            statement_type=statement_type,
-        )
+        # Return formatted results. The rows come from BigQuery's typed schema, so the response is
+        # serialized directly instead of being validated against QueryResult again.
+        with span("build_response"):
+            return FastJSONResponse(
+                {
+                    "rows": rows,
+                    "total_rows": len(rows),
+                    "schemas": schemas,
+                    "bytes_processed": query_job.total_bytes_processed,
+                    "gbytes_processed": dry_run_job.total_bytes_processed / (1024 * 1024 * 1024),
+                    "job_id": query_job.job_id,
+                    "statement_type": statement_type,
+                    "referenced_tables": [f"{t.project}.{t.dataset_id}.{t.table_id}" for t in referenced_tables],
+                }
+            )
 
     except Exception as e:
         if isinstance(e, HTTPException):
@@ -1,9 +1,15 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from google.cloud import bigquery
 
 from app.clients.bigquery import get_bigquery_client
 from app.config.settings import ALLOWED_DATASETS, PROJECT_ID
+from app.metrics import BIGQUERY_JOB_DURATION
 from app.schemas.bigquery import ColumnDetails, Table, TableDetails
+from app.tracing import span
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -29,8 +35,9 @@ async def list_tables(
         # List tables based on dataset filter
         if dataset_id:
             dataset_ref = client.dataset(dataset_id)
-            bq_tables = list(client.list_tables(dataset_ref))
-            print(f"# bq_tables: {len(bq_tables)}")
+            with BIGQUERY_JOB_DURATION.time("list_tables"):
+                bq_tables = list(client.list_tables(dataset_ref))
+            logger.debug("Listed %d tables in dataset %s", len(bq_tables), dataset_id)
 
             for table in bq_tables:
                 tables.append(Table(table_id=table.table_id, dataset_id=dataset_id))
@@ -42,8 +49,9 @@ async def list_tables(
 
             for ds_id in datasets_to_query:
                 dataset_ref = client.dataset(ds_id)
-                bq_tables = list(client.list_tables(dataset_ref))
-                print(f"# bq_tables: {len(bq_tables)}")
+                with BIGQUERY_JOB_DURATION.time("list_tables"):
+                    bq_tables = list(client.list_tables(dataset_ref))
+                logger.debug("Listed %d tables in dataset %s", len(bq_tables), ds_id)
 
                 for table in bq_tables:
                     tables.append(Table(table_id=table.table_id, dataset_id=ds_id))
@@ -83,9 +91,10 @@ async def describe_table(dataset_id: str, table_id: str, client: bigquery.Client
         """
 
         table_info = None
-        for row in client.query(schema_query).result():
-            table_info = row
-            break
+        with span("table_info"), BIGQUERY_JOB_DURATION.time("describe_table"):
+            for row in client.query(schema_query).result():
+                table_info = row
+                break
 
         if not table_info:
             raise HTTPException(status_code=404, detail=f"Table {dataset_id}.{table_id} not found")
@@ -100,17 +109,19 @@ async def describe_table(dataset_id: str, table_id: str, client: bigquery.Client
         FROM `{PROJECT_ID}.{dataset_id}`.INFORMATION_SCHEMA.COLUMNS
         WHERE table_name = '{table_id}'
         """
-        column_details = client.query(column_query).result()
+        with span("columns"), BIGQUERY_JOB_DURATION.time("describe_table_columns"):
+            column_details = client.query(column_query).result()
         columns = []
-        for row in column_details:
-            columns.append(
-                ColumnDetails(
-                    column_name=row.column_name,
-                    is_nullable=row.is_nullable,
-                    data_type=row.data_type,
-                    is_partitioning_column=row.is_partitioning_column,
+        with span("fetch_rows"):
+            for row in column_details:
+                columns.append(
+                    ColumnDetails(
+                        column_name=row.column_name,
+                        is_nullable=row.is_nullable,
+                        data_type=row.data_type,
+                        is_partitioning_column=row.is_partitioning_column,
+                    )
                 )
-            )
 
         # Create response object
         table_details = TableDetails(
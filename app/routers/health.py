@@ -1,32 +1,55 @@
+import asyncio
+import logging
 import time
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
+
+from app.config.settings import HEALTH_MAX_WAIT
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
 @router.get("/health")
-def health_check(timeout: float = 0.0):
-    """
-    Health check endpoint to verify the API is running.
-    Prints a message every second during the wait period.
+async def health_check(timeout: float = 0.0):
     """
-    try:
-        start_time = time.time()
-        end_time = start_time + timeout
+    Liveness endpoint to verify the API is running. Does not check dependencies (see /health/ready).
 
-        while time.time() < end_time:
-            elapsed = time.time() - start_time
-            print(f"Health check running... {elapsed:.1f}s elapsed")
+    With a timeout (capped at HEALTH_MAX_WAIT seconds), the response is delayed without holding a
+    worker thread, e.g. to test client timeouts.
+    """
+    start_time = time.time()
+    wait = min(max(timeout, 0.0), HEALTH_MAX_WAIT)
+    if wait > 0:
+        logger.debug("Health check waiting %.1fs", wait)
+        await asyncio.sleep(wait)
+    return {"status": "ok", "elapsed_time": time.time() - start_time}
 
-            remaining = min(1.0, end_time - time.time())
-            if remaining > 0:
-                time.sleep(remaining)
 
-        total_elapsed = time.time() - start_time
-        print(f"Health check complete. Total time: {total_elapsed:.2f}s")
+@router.get("/ready")
+async def readiness_check(request: Request, response: Response, strict: bool = False):
+    """
+    Readiness endpoint reporting the state of each subsystem.
 
-        return {"status": "ok", "elapsed_time": total_elapsed}
-    except Exception as e:
-        print(f"Error during health check: {str(e)}")
-        return {"status": "error", "message": str(e)}
+    BigQuery, Qdrant and the embedding model are probed in the background (see app.health), so
+    this endpoint only returns the cached probe results. BigQuery and sequential-thinking routes
+    can serve as soon as the app has started, while the embedding model may still be loading.
+    With strict=true, a 503 is returned until every subsystem is ready.
+    """
+    health_monitor = getattr(request.app.state, "health_monitor", None)
+    subsystems = health_monitor.snapshot() if health_monitor is not None else {}
+    subsystems["sequential_thinking"] = {"status": "ready"}
+
+    statuses = [subsystem["status"] for subsystem in subsystems.values()]
+    if all(status == "ready" for status in statuses):
+        status = "ready"
+    elif "failed" in statuses:
+        status = "degraded"
+    else:
+        status = "starting"
+
+    if strict and status != "ready":
+        response.status_code = 503
+
+    return {"status": status, "subsystems": subsystems}
@@ -1,14 +1,34 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
 
-from app.clients.qdrant import get_qdrant_client
-from app.config.settings import EMBEDDING_SIZE
+from app.clients.qdrant import collection_cache, get_qdrant_client
+from app.config.settings import EMBEDDING_SIZE, QDRANT_EXACT_COUNT
 from app.schemas.knowledge_base import CollectionInfo
 
 router = APIRouter()
 
 
+def _get_collection_info(client: QdrantClient, collection_name: str) -> CollectionInfo:
+    collection_info = client.get_collection(collection_name=collection_name)
+
+    if QDRANT_EXACT_COUNT:
+        try:
+            count = client.count(collection_name=collection_name, exact=True).count
+        except Exception:
+            count = 0
+    else:
+        # Approximate count reported with the collection info, avoids an extra round trip
+        count = collection_info.points_count or 0
+
+    return CollectionInfo(
+        name=collection_name, vector_size=collection_info.config.params.vectors.size, document_count=count
+    )
+
+
 @router.post("/collections/{collection_name}", operation_id="create_collection")
 async def create_collection(collection_name: str, client: QdrantClient = Depends(get_qdrant_client)):
     """
@@ -29,6 +49,7 @@ async def create_collection(collection_name: str, client: QdrantClient = Depends
                 distance=models.Distance.COSINE,
             ),
         )
+        collection_cache.invalidate()
 
         return {"status": "success", "message": f"Collection '{collection_name}' created successfully"}
     except Exception as e:
@@ -41,26 +62,23 @@ async def create_collection(collection_name: str, client: QdrantClient = Depends
 async def list_collections(client: QdrantClient = Depends(get_qdrant_client)):
     """
     List all collections in Qdrant.
+
+    Document counts are approximate unless QDRANT_EXACT_COUNT is enabled.
     """
     try:
-        collections_info = []
-        collections = client.get_collections().collections
-
-        for collection in collections:
-            collection_info = client.get_collection(collection_name=collection.name)
-
-            try:
-                count_result = client.count(collection_name=collection.name)
-                count = count_result.count
-            except Exception:
-                count = 0
-
-            collections_info.append(
-                CollectionInfo(
-                    name=collection.name, vector_size=collection_info.config.params.vectors.size, document_count=count
-                )
+        cached = collection_cache.get()
+        if cached is not None:
+            return cached
+
+        generation = collection_cache.generation
+        collections = (await run_in_threadpool(client.get_collections)).collections
+        collections_info = list(
+            await asyncio.gather(
+                *(run_in_threadpool(_get_collection_info, client, collection.name) for collection in collections)
             )
+        )
 
+        collection_cache.set(collections_info, generation)
         return collections_info
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing collections: {str(e)}")
@@ -76,6 +94,7 @@ async def delete_collection(collection_name: str, client: QdrantClient = Depends
     """
     try:
         client.delete_collection(collection_name=collection_name)
+        collection_cache.invalidate()
         return {"status": "success", "message": f"Collection '{collection_name}' deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting collection: {str(e)}")
@@ -1,16 +1,61 @@
+import json
+import logging
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
 
 from app.clients.embedding import get_embedding_client
-from app.clients.qdrant import get_qdrant_client
-from app.schemas.knowledge_base import Document, DocumentResponse, SearchRequest, SearchResponse
+from app.clients.qdrant import collection_cache, get_qdrant_client
+from app.responses import FastJSONResponse
+from app.schemas.knowledge_base import (
+    Document,
+    DocumentBatch,
+    IngestResponse,
+    SearchRequest,
+    SearchResponse,
+)
+from app.tracing import span
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _build_document_id(collection_name: str, document: Document) -> str:
+    """
+    Build a deterministic document ID from the collection name and the document content.
+
+    The text is whitespace-normalized and the metadata is serialized with sorted keys, so
+    re-ingesting the same document always yields the same ID.
+    """
+    normalized_text = " ".join(document.text.split())
+    metadata = json.dumps(document.metadata or {}, sort_keys=True, ensure_ascii=False, default=str)
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{collection_name}\x00{normalized_text}\x00{metadata}"))
+
+
+def _build_payload(document: Document) -> dict:
+    payload = {"text": document.text}
+    if document.metadata is not None:
+        payload["metadata"] = document.metadata
+    return payload
+
+
+def _existing_document_ids(qdrant_client: QdrantClient, collection_name: str, document_ids: list[str]) -> set[str]:
+    """Return the subset of document_ids already stored in the collection, using a single bulk lookup."""
+    if not document_ids:
+        return set()
+    points = qdrant_client.retrieve(
+        collection_name=collection_name,
+        ids=document_ids,
+        with_payload=False,
+        with_vectors=False,
+    )
+    return {str(point.id) for point in points}
+
+
 @router.post("/{collection_name}/documents", response_model=Document, operation_id="add_document")
 async def add_document(
     collection_name: str,
@@ -21,32 +66,83 @@ async def add_document(
     """
     Add a document to the knowledge base.
 
+    The document ID is derived from the text and metadata, so an edited document is stored as a new
+    document. To update a document, delete the old ID first.
+
     Args:
         document: Document to be added
     """
     try:
-        payload = {"text": document.text}
-        if document.metadata is not None:
-            payload["metadata"] = document.metadata
+        document_id = _build_document_id(collection_name, document)
+        if _existing_document_ids(qdrant_client, collection_name, [document_id]):
+            return document
 
-        document_id = str(uuid.uuid4())
-        vector = embedding_client.embed(document.text)
+        # Embedding blocks (inference, or a round trip to the embedding server), so it runs off the event loop
+        vector = await run_in_threadpool(embedding_client.embed, document.text)
         qdrant_client.upsert(
             collection_name=collection_name,
             points=[
                 models.PointStruct(
                     id=document_id,
                     vector=vector,
-                    payload=payload,
+                    payload=_build_payload(document),
                 )
             ],
         )
+        collection_cache.invalidate()
 
         return document
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error adding document: {str(e)}")
 
 
+@router.post("/{collection_name}/documents/batch", response_model=IngestResponse, operation_id="add_documents")
+async def add_documents(
+    collection_name: str,
+    batch: DocumentBatch,
+    qdrant_client: QdrantClient = Depends(get_qdrant_client),
+    embedding_client=Depends(get_embedding_client),
+):
+    """
+    Add multiple documents to the knowledge base.
+
+    Document IDs are derived from the document content, so documents that are already stored
+    are skipped without being re-embedded. An edited document gets a new ID and is added next to
+    the old one; to update a document, delete the old ID first.
+
+    Args:
+        batch: Documents to be added
+    """
+    try:
+        document_ids = [_build_document_id(collection_name, document) for document in batch.documents]
+
+        existing_ids = set()
+        if batch.skip_existing:
+            existing_ids = _existing_document_ids(qdrant_client, collection_name, list(dict.fromkeys(document_ids)))
+
+        # Deduplicate within the batch as well as against the collection
+        pending = {}
+        for document_id, document in zip(document_ids, batch.documents, strict=True):
+            if document_id not in existing_ids and document_id not in pending:
+                pending[document_id] = document
+
+        if pending:
+            texts = [document.text for document in pending.values()]
+            vectors = await run_in_threadpool(embedding_client.embed_batch, texts)
+            qdrant_client.upsert(
+                collection_name=collection_name,
+                points=[
+                    models.PointStruct(id=document_id, vector=vector, payload=_build_payload(document))
+                    for (document_id, document), vector in zip(pending.items(), vectors, strict=True)
+                ],
+            )
+            collection_cache.invalidate()
+
+        return IngestResponse(ids=document_ids, added=len(pending), skipped=len(document_ids) - len(pending))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error adding documents: {str(e)}")
+
+
 @router.post("/{collection_name}/search", response_model=SearchResponse, operation_id="search_documents")
 async def search_documents(
     collection_name: str,
@@ -61,8 +157,16 @@ async def search_documents(
         request: Search request containing the query and optional filters
     """
     try:
-        query_vector = embedding_client.embed(request.query)
-        search_params = {"collection_name": collection_name, "query_vector": query_vector, "limit": request.limit}
+        query_vector = await run_in_threadpool(embedding_client.embed, request.query)
+        search_params = {
+            "collection_name": collection_name,
+            "query_vector": query_vector,
+            "limit": request.limit,
+            # Only the requested payload fields are transferred from Qdrant
+            "with_payload": False if request.ids_only else (request.with_payload or True),
+        }
+        if request.score_threshold is not None:
+            search_params["score_threshold"] = request.score_threshold
 
         if request.filter is not None:
             filter_conditions = []
@@ -76,18 +180,25 @@ async def search_documents(
 
         search_results = qdrant_client.search(**search_params)
 
-        documents = []
-        for result in search_results:
-            print(f"# result: {result}")
-            doc = DocumentResponse(
-                id=result.id,
-                text=result.payload.get("text", ""),
-                metadata=result.payload.get("metadata", {}),
-                score=result.score,
-            )
-            documents.append(doc)
-
-        return SearchResponse(results=documents)
+        # Hits are serialized directly instead of building and re-validating a DocumentResponse
+        # per hit, so response_model does not apply; fields that are None are omitted here.
+        full_payload = request.with_payload is None and not request.ids_only
+        with span("build_response"):
+            documents = []
+            for result in search_results:
+                logger.debug("search result: %s", result)
+                payload = result.payload or {}
+                doc = {"id": str(result.id)}
+                text = payload.get("text", "" if full_payload else None)
+                if text is not None:
+                    doc["text"] = text[: request.max_text_chars] if request.max_text_chars is not None else text
+                metadata = payload.get("metadata", {} if full_payload else None)
+                if metadata is not None:
+                    doc["metadata"] = metadata
+                doc["score"] = result.score
+                documents.append(doc)
+
+            return FastJSONResponse({"results": documents})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching documents: {str(e)}")
 
@@ -109,6 +220,7 @@ async def delete_document(
             collection_name=collection_name,
             points_selector=models.PointIdsList(points=[document_id]),
         )
+        collection_cache.invalidate()
         return {"status": "success", "message": f"Document '{document_id}' deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting document: {str(e)}")
@@ -0,0 +1,231 @@
+import json
+import struct
+from collections.abc import AsyncIterator, Iterator
+from typing import Literal
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from app.clients.qdrant import collection_cache, get_qdrant_client
+
+router = APIRouter()
+
+# Both formats start with a header record, {"collection": {"size": ..., "distance": ...}}, that
+# holds the vector parameters, followed by one record per point.
+# Binary export format: BINARY_MAGIC, then for every record a record header of
+# (metadata length, vector dimension) as little-endian uint32, the UTF-8 JSON metadata
+# ({"id": ..., "payload": ...}, or the collection header with dimension 0) and the vector as
+# little-endian float32.
+BINARY_MAGIC = b"QKB1"
+RECORD_HEADER = struct.Struct("<II")
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "binary": "application/octet-stream"}
+
+ExportFormat = Literal["ndjson", "binary"]
+
+
+def _iter_point_batches(client: QdrantClient, collection_name: str, batch_size: int) -> Iterator[list]:
+    """Page through a collection with scroll, holding at most one page in memory."""
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        if points:
+            yield points
+        if offset is None:
+            break
+
+
+def _collection_header(client: QdrantClient, collection_name: str) -> dict:
+    vectors = client.get_collection(collection_name=collection_name).config.params.vectors
+    if not isinstance(vectors, models.VectorParams):
+        raise HTTPException(status_code=400, detail="Collections with named vectors cannot be exported")
+    return {"collection": {"size": vectors.size, "distance": vectors.distance.value}}
+
+
+def _encode_header(format: ExportFormat, header: dict) -> bytes:
+    if format == "ndjson":
+        return (json.dumps(header) + "\n").encode("utf-8")
+    metadata = json.dumps(header).encode("utf-8")
+    return BINARY_MAGIC + RECORD_HEADER.pack(len(metadata), 0) + metadata
+
+
+def _read_vectors_config(header: dict) -> models.VectorParams:
+    try:
+        return models.VectorParams(size=header["size"], distance=models.Distance(header["distance"]))
+    except (KeyError, TypeError, ValidationError) as e:
+        raise ValueError(f"Invalid collection header: {header}") from e
+
+
+def _read_point(record: dict) -> models.PointStruct:
+    if not isinstance(record, dict) or "id" not in record or not isinstance(record.get("vector"), list):
+        raise ValueError("Invalid record: every point needs an 'id' and a 'vector'")
+    try:
+        return models.PointStruct(id=record["id"], vector=record["vector"], payload=record.get("payload"))
+    except ValidationError as e:
+        raise ValueError(f"Invalid record with id {record['id']!r}: {e}") from e
+
+
+def _encode_ndjson(points: list) -> bytes:
+    lines = [
+        json.dumps({"id": point.id, "payload": point.payload, "vector": point.vector}, ensure_ascii=False)
+        for point in points
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _encode_binary(points: list) -> bytes:
+    chunks = []
+    for point in points:
+        metadata = json.dumps({"id": point.id, "payload": point.payload}, ensure_ascii=False).encode("utf-8")
+        vector = np.asarray(point.vector, dtype="<f4")
+        chunks.append(RECORD_HEADER.pack(len(metadata), len(vector)))
+        chunks.append(metadata)
+        chunks.append(vector.tobytes())
+    return b"".join(chunks)
+
+
+async def _iter_ndjson_records(stream: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if buffer.strip():
+        yield json.loads(buffer)
+
+
+async def _iter_binary_records(stream: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    buffer = bytearray()
+    magic_checked = False
+    async for chunk in stream:
+        buffer += chunk
+        if not magic_checked:
+            if len(buffer) < len(BINARY_MAGIC):
+                continue
+            if buffer[: len(BINARY_MAGIC)] != BINARY_MAGIC:
+                raise ValueError("Invalid binary export: missing header")
+            del buffer[: len(BINARY_MAGIC)]
+            magic_checked = True
+
+        while len(buffer) >= RECORD_HEADER.size:
+            metadata_size, dimension = RECORD_HEADER.unpack_from(buffer)
+            record_size = RECORD_HEADER.size + metadata_size + dimension * 4
+            if len(buffer) < record_size:
+                break
+            metadata_end = RECORD_HEADER.size + metadata_size
+            record = json.loads(bytes(buffer[RECORD_HEADER.size : metadata_end]))
+            record["vector"] = np.frombuffer(buffer, dtype="<f4", count=dimension, offset=metadata_end).tolist()
+            del buffer[:record_size]
+            yield record
+
+    if buffer:
+        raise ValueError("Invalid binary export: truncated record")
+
+
+@router.get("/collections/{collection_name}/export", operation_id="export_collection")
+def export_collection(
+    collection_name: str,
+    format: ExportFormat = Query("ndjson", description="Export format: 'ndjson' or 'binary'"),
+    batch_size: int = Query(256, gt=0, le=10000, description="Number of points fetched per scroll request"),
+    client: QdrantClient = Depends(get_qdrant_client),
+):
+    """
+    Export a collection as a stream of points (ID, payload and vector).
+
+    The collection is paged through with scroll, so memory usage does not depend on the collection size.
+
+    Args:
+        collection_name: Name of the collection to export
+    """
+    if not client.collection_exists(collection_name=collection_name):
+        raise HTTPException(status_code=404, detail=f"Collection '{collection_name}' not found")
+
+    header = _collection_header(client, collection_name)
+    encode = _encode_ndjson if format == "ndjson" else _encode_binary
+
+    def stream() -> Iterator[bytes]:
+        yield _encode_header(format, header)
+        for points in _iter_point_batches(client, collection_name, batch_size):
+            yield encode(points)
+
+    return StreamingResponse(
+        stream(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{collection_name}.{format}"'},
+    )
+
+
+@router.post("/collections/{collection_name}/import", operation_id="import_collection")
+async def import_collection(
+    collection_name: str,
+    request: Request,
+    format: ExportFormat = Query("ndjson", description="Import format: 'ndjson' or 'binary'"),
+    batch_size: int = Query(256, gt=0, le=10000, description="Number of points per upsert request"),
+    client: QdrantClient = Depends(get_qdrant_client),
+):
+    """
+    Import points produced by the export endpoint, without recomputing embeddings.
+
+    The request body is read as a stream and upserted in batches. If the collection does not exist
+    yet, it is created with the vector size and distance of the exported collection.
+
+    Args:
+        collection_name: Name of the collection to import into
+    """
+    records = _iter_ndjson_records(request.stream()) if format == "ndjson" else _iter_binary_records(request.stream())
+    try:
+        collection_ready = await run_in_threadpool(client.collection_exists, collection_name=collection_name)
+        vectors_config = None
+        imported = 0
+        batch = []
+        async for record in records:
+            if vectors_config is None:
+                if not isinstance(record, dict) or "collection" not in record:
+                    raise ValueError("Invalid export: missing collection header")
+                vectors_config = _read_vectors_config(record["collection"])
+                continue
+
+            point = _read_point(record)
+            if len(point.vector) != vectors_config.size:
+                raise ValueError(f"Invalid record with id {point.id!r}: expected {vectors_config.size} dimensions")
+            if not collection_ready:
+                await run_in_threadpool(
+                    client.create_collection, collection_name=collection_name, vectors_config=vectors_config
+                )
+                collection_ready = True
+
+            batch.append(point)
+            if len(batch) >= batch_size:
+                await run_in_threadpool(client.upsert, collection_name=collection_name, points=batch)
+                imported += len(batch)
+                batch = []
+
+        if batch:
+            await run_in_threadpool(client.upsert, collection_name=collection_name, points=batch)
+            imported += len(batch)
+
+        return {
+            "status": "success",
+            "message": f"Imported {imported} documents into collection '{collection_name}'",
+            "imported": imported,
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Error importing collection: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error importing collection: {str(e)}")
+    finally:
+        # Also after a failed import, which may have created the collection or upserted some batches
+        collection_cache.invalidate()
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.config.settings import PROFILING_DIR, PROFILING_ENABLED
+
+router = APIRouter()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: str):
+    """
+    Download a stored request profile in folded-stacks format (the X-Profile-Id response header).
+
+    Render it with e.g. `flamegraph.pl profile.folded > profile.svg` or open it in speedscope.
+    Only available with PROFILING_ENABLED, as the stacks contain source file paths.
+    """
+    path = Path(PROFILING_DIR) / profile_id
+    if not PROFILING_ENABLED or Path(profile_id).name != profile_id or path.suffix != ".folded" or not path.is_file():
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return PlainTextResponse(path.read_text())
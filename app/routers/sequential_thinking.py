@@ -1,8 +1,11 @@
+import logging
 import uuid
 from datetime import datetime
+from functools import partial
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 
+from app.clients.thought_store import ThoughtRecord, ThoughtStore, get_thought_store
 from app.schemas.sequential_thinking import (
     BranchDetails,
     ThoughtBase,
@@ -10,30 +13,39 @@ from app.schemas.sequential_thinking import (
     ThoughtResponse,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-# In-memory storage for thoughts and branches
-thought_history = []
-branches = {}  # Dict mapping branch_id to list of thought_ids
+DEFAULT_SESSION_ID = "default"
+
+
+def get_session_id(x_session_id: str | None = Header(None, description="Session identifier")) -> str:
+    """
+    Get the sequential thinking session from the X-Session-ID header.
+
+    Requests without the header share the default session.
+    """
+    return x_session_id or DEFAULT_SESSION_ID
 
 
-def format_thought(thought_data: dict) -> str:
+def format_thought(thought_data: ThoughtRecord) -> str:
     """Format a thought for console display"""
     prefix = ""
     context = ""
 
-    if thought_data.get("is_revision"):
+    if thought_data.is_revision:
         prefix = "🔄 Revision"
-        context = f" (revising thought {thought_data.get('revises_thought')})"
-    elif thought_data.get("branch_from_thought"):
+        context = f" (revising thought {thought_data.revises_thought})"
+    elif thought_data.branch_from_thought:
         prefix = "🌿 Branch"
-        context = f" (from thought {thought_data.get('branch_from_thought')}, ID: {thought_data.get('branch_id')})"
+        context = f" (from thought {thought_data.branch_from_thought}, ID: {thought_data.branch_id})"
     else:
         prefix = "💭 Thought"
         context = ""
 
-    header = f"{prefix} {thought_data.get('thought_number')}/{thought_data.get('total_thoughts')}{context}"
-    thought_text = thought_data.get("thought")
+    header = f"{prefix} {thought_data.thought_number}/{thought_data.total_thoughts}{context}"
+    thought_text = thought_data.thought
 
     border_len = max(len(header), len(thought_text)) + 4
     border = "─" * border_len
@@ -46,8 +58,14 @@ def format_thought(thought_data: dict) -> str:
 └{border}┘"""
 
 
+# The routes are plain functions, so they run in the threadpool: the sqlite and log stores block on
+# file locks shared with the other workers.
 @router.post("/sequential-thinking", response_model=ThoughtResponse, operation_id="sequential_thinking")
-async def process_thought(thought: ThoughtBase):
+def process_thought(
+    thought: ThoughtBase,
+    session_id: str = Depends(get_session_id),
+    store: ThoughtStore = Depends(get_thought_store),
+):
     """
     Process a sequential thinking step.
 
@@ -66,6 +84,8 @@ async def process_thought(thought: ThoughtBase):
     - branch_id: Identifier for the current branch
     - needs_more_thoughts: If more thoughts are needed than initially estimated
 
+    Thoughts are stored per session, identified by the X-Session-ID header.
+
     Returns:
     - Information about the processed thought including its ID, statistics, and available branches
     """
@@ -89,31 +109,33 @@ async def process_thought(thought: ThoughtBase):
         current_time = datetime.now()
 
         # Create thought record
-        thought_record = {
-            "id": thought_id,
-            "thought": thought.thought,
-            "thought_number": thought.thought_number,
-            "total_thoughts": adjusted_total_thoughts,
-            "next_thought_needed": thought.next_thought_needed,
-            "is_revision": thought.is_revision,
-            "revises_thought": thought.revises_thought,
-            "branch_from_thought": thought.branch_from_thought,
-            "branch_id": thought.branch_id,
-            "needs_more_thoughts": thought.needs_more_thoughts,
-            "timestamp": current_time,
-        }
-
-        # Add to thought history
-        thought_history.append(thought_record)
-
-        # Handle branch logic
-        if thought.branch_id:
-            if thought.branch_id not in branches:
-                branches[thought.branch_id] = []
-            branches[thought.branch_id].append(thought_id)
-
-        # Print formatted thought to console for logging
-        print(format_thought(thought_record))
+        thought_record = ThoughtRecord(
+            id=thought_id,
+            thought=thought.thought,
+            thought_number=thought.thought_number,
+            total_thoughts=adjusted_total_thoughts,
+            next_thought_needed=thought.next_thought_needed,
+            is_revision=thought.is_revision,
+            revises_thought=thought.revises_thought,
+            branch_from_thought=thought.branch_from_thought,
+            branch_id=thought.branch_id,
+            needs_more_thoughts=thought.needs_more_thoughts,
+            timestamp=current_time,
+        )
+
+        # Add to the session's thought history and branches
+        branches, thought_history_length = store.add_thought(session_id, thought_record)
+
+        # Rendering happens on the logging thread, and only in pretty mode
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Thought processed",
+                extra={
+                    "session_id": session_id,
+                    "thought": thought_record,
+                    "pretty": partial(format_thought, thought_record),
+                },
+            )
 
         # Return response
         return ThoughtResponse(
@@ -121,8 +143,8 @@ async def process_thought(thought: ThoughtBase):
             thought_number=thought.thought_number,
             total_thoughts=adjusted_total_thoughts,
             next_thought_needed=thought.next_thought_needed,
-            branches=list(branches.keys()),
-            thought_history_length=len(thought_history),
+            branches=branches,
+            thought_history_length=thought_history_length,
             timestamp=current_time,
         )
 
@@ -137,13 +159,23 @@ async def process_thought(thought: ThoughtBase):
     response_model=list[ThoughtHistory],
     operation_id="sequential_thinking_history",
 )
-async def get_thought_history():
+def get_thought_history(
+    since_id: str | None = Query(None, description="Only return thoughts added after the thought with this ID"),
+    thought_number: int | None = Query(None, description="Only return thoughts with this thought number"),
+    limit: int = Query(100, gt=0, le=1000, description="Maximum number of thoughts to return"),
+    session_id: str = Depends(get_session_id),
+    store: ThoughtStore = Depends(get_thought_store),
+):
     """
-    Get the full history of sequential thoughts processed so far.
+    Get the history of sequential thoughts processed so far in the session.
 
-    Returns a list of all thoughts in the history, ordered by when they were added.
+    Returns thoughts ordered by when they were added. Pass the ID of the last thought received
+    as since_id to read the next page.
     """
-    return [ThoughtHistory(**record) for record in thought_history]
+    try:
+        return store.get_history(session_id, since_id=since_id, limit=limit, thought_number=thought_number)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Thought with ID {since_id} not found")
 
 
 @router.get(
@@ -151,7 +183,11 @@ async def get_thought_history():
     response_model=BranchDetails,
     operation_id="sequential_thinking_branch",
 )
-async def get_branch_thoughts(branch_id: str):
+def get_branch_thoughts(
+    branch_id: str,
+    session_id: str = Depends(get_session_id),
+    store: ThoughtStore = Depends(get_thought_store),
+):
     """
     Get details about a specific branch including all thoughts in that branch.
 
@@ -161,21 +197,21 @@ async def get_branch_thoughts(branch_id: str):
     Returns:
         Details about the branch and the thought IDs it contains
     """
-    if branch_id not in branches:
+    thought_ids = store.get_branch(session_id, branch_id)
+    if thought_ids is None:
         raise HTTPException(status_code=404, detail=f"Branch with ID {branch_id} not found")
 
-    return BranchDetails(id=branch_id, thoughts=branches[branch_id])
+    return BranchDetails(id=branch_id, thoughts=thought_ids)
 
 
 @router.get("/metadata", operation_id="sequential_thinking_metadata")
-async def get_metadata():
+def get_metadata(
+    session_id: str = Depends(get_session_id),
+    store: ThoughtStore = Depends(get_thought_store),
+):
     """
     Get metadata about the sequential thinking process.
 
     Returns information about the number of thoughts, branches, and other statistics.
     """
-    return {
-        "total_thoughts": len(thought_history),
-        "total_branches": len(branches),
-        "branches": [{"id": b_id, "thought_count": len(thoughts)} for b_id, thoughts in branches.items()],
-    }
+    return store.get_metadata(session_id)
@@ -1,6 +1,6 @@
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Dataset(BaseModel):
@@ -45,7 +45,10 @@ class QueryRequest(BaseModel):
 
 
 class QueryResult(BaseModel):
-    rows: list[dict[str, Any]]
+    rows: list[dict[str, Any]] = Field(
+        ...,
+        description="Result rows. NUMERIC/BIGNUMERIC values are strings, BYTES values are base64-encoded strings.",
+    )
     total_rows: int
     schemas: list[TableSchema]
     bytes_processed: int
@@ -11,6 +11,21 @@ class Document(BaseModel):
     )
 
 
+class DocumentBatch(BaseModel):
+    documents: list[Document] = Field(..., description="Documents to be added")
+    skip_existing: bool = Field(
+        True,
+        description="Skip documents whose content-derived ID already exists in the collection, "
+        "so unchanged documents are not re-embedded.",
+    )
+
+
+class IngestResponse(BaseModel):
+    ids: list[str] = Field(..., description="Document IDs in the same order as the submitted documents")
+    added: int = Field(..., description="Number of documents embedded and upserted")
+    skipped: int = Field(..., description="Number of documents skipped because they already exist")
+
+
 class SearchRequest(BaseModel):
     query: str = Field(..., description="Search query")
     limit: int = Field(10, description="Maximum number of documents to return")
@@ -19,11 +34,24 @@ class SearchRequest(BaseModel):
         description="Filter based on metadata. 'metadata' is a dictionary with key-value pairs, "
         "e.g., {'metadata': {'publish_date': '2023-05-20'}}",
     )
+    with_payload: list[str] | None = Field(
+        None,
+        min_length=1,
+        description="Payload fields to return, e.g. ['text'] or ['metadata.publish_date']. Returns all fields if "
+        "omitted. Use ids_only to return no payload.",
+    )
+    max_text_chars: int | None = Field(
+        None, gt=0, description="Truncate the returned text to this many characters. Optional."
+    )
+    ids_only: bool = Field(False, description="Return only document IDs and scores, without any payload")
+    score_threshold: float | None = Field(
+        None, description="Only return documents with a similarity score of at least this value. Optional."
+    )
 
 
 class DocumentResponse(BaseModel):
     id: str = Field(..., description="Document ID")
-    text: str = Field(..., description="Document text content")
+    text: str | None = Field(None, description="Document text content. Omitted if not requested.")
     metadata: dict[str, Any] | None = Field(
         None, description="Metadata about the document in key-value pairs. Optional."
     )
@@ -0,0 +1,220 @@
+"""
+Opt-in per-request tracing and profiling.
+
+Spans around the stages of a request (BigQuery jobs, row conversion, embedding, Qdrant calls,
+response building) are summarized in a Server-Timing response header. A request can also be
+profiled with a sampling profiler whose output is stored as folded stacks, the input format of
+flame graph tools such as flamegraph.pl or speedscope.
+"""
+
+import contextlib
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import (
+    PROFILING_DIR,
+    PROFILING_ENABLED,
+    PROFILING_INTERVAL,
+    PROFILING_MAX_FILES,
+    PROFILING_SAMPLE_RATE,
+    TRACING_ENABLED,
+)
+
+
+class Trace:
+    """Spans recorded during one request."""
+
+    __slots__ = ("spans", "thread_ids", "last_end")
+
+    def __init__(self):
+        self.spans: list[tuple[str, float]] = []
+        self.thread_ids = {threading.get_ident()}
+        self.last_end: float | None = None
+
+    def server_timing(self, total: float, respond: float | None) -> str:
+        """
+        Render the spans as a Server-Timing header value, summing spans with the same name.
+        """
+        durations: dict[str, float] = {}
+        for name, duration in self.spans:
+            durations[name] = durations.get(name, 0.0) + duration
+        entries = [f"{name};dur={duration * 1000:.3f}" for name, duration in durations.items()]
+        if respond is not None:
+            entries.append(f'respond;desc="validation and serialization";dur={respond * 1000:.3f}')
+        entries.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar("trace", default=None)
+
+
+@contextmanager
+def span(name: str):
+    """
+    Time a stage of the current request. Does nothing when the request is not traced.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    # Work offloaded to a thread pool is sampled by the profiler as well
+    trace.thread_ids.add(threading.get_ident())
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        trace.spans.append((name, end - start))
+        trace.last_end = end
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for the threads of one request.
+
+    A background thread samples the stacks of the given threads every `interval` seconds. On
+    the event loop thread, other requests served concurrently show up in the samples too.
+    """
+
+    def __init__(self, thread_ids: set[int], interval: float = PROFILING_INTERVAL):
+        self.thread_ids = thread_ids
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling. Safe to call more than once."""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.thread_ids):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.samples[_folded_stack(frame)] += 1
+
+    def folded(self) -> str:
+        """
+        Returns:
+            str: One "frame;frame;... count" line per distinct stack, root frame first.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def _folded_stack(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def save_profile(profile: str, label: str, directory: str = PROFILING_DIR, max_files: int = PROFILING_MAX_FILES) -> str:
+    """
+    Store a folded-stacks profile in `directory`, deleting the oldest profiles beyond `max_files`.
+
+    Returns:
+        str: The profile ID, i.e. the file name.
+    """
+    profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}.folded"
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    (path / profile_id).write_text(profile)
+
+    profiles = sorted(path.glob("*.folded"), key=_mtime_or_zero)
+    for old_profile in profiles[: max(len(profiles) - max_files, 0)]:
+        # Another worker may delete the same file concurrently
+        with contextlib.suppress(FileNotFoundError):
+            old_profile.unlink()
+    return profile_id
+
+
+def _mtime_or_zero(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware tracing requests when TRACING_ENABLED is set. With PROFILING_ENABLED, requests
+    that send the X-Profile header or are sampled with PROFILING_SAMPLE_RATE are profiled.
+
+    Traced responses get a Server-Timing header; profiled responses also get an X-Profile-Id
+    header naming the stored profile.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        tracing_enabled: bool = TRACING_ENABLED,
+        profiling_enabled: bool = PROFILING_ENABLED,
+        sample_rate: float = PROFILING_SAMPLE_RATE,
+    ):
+        self.app = app
+        self.tracing_enabled = tracing_enabled
+        self.profiling_enabled = profiling_enabled
+        self.sample_rate = sample_rate
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if not self.profiling_enabled:
+            return False
+        if any(name == b"x-profile" for name, _ in scope["headers"]):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = self._should_profile(scope)
+        if not (self.tracing_enabled or profile):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace()
+        profiler = SamplingProfiler(trace.thread_ids) if profile else None
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                headers = MutableHeaders(scope=message)
+                respond = now - trace.last_end if trace.last_end is not None else None
+                headers.append("Server-Timing", trace.server_timing(now - start, respond))
+                if profiler is not None:
+                    profiler.stop()
+                    route = scope.get("route")
+                    label = getattr(route, "operation_id", None) or getattr(route, "name", None) or "request"
+                    headers.append("X-Profile-Id", save_profile(profiler.folded(), label))
+            await send(message)
+
+        token = _current_trace.set(trace)
+        if profiler is not None:
+            profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            if profiler is not None:
+                profiler.stop()
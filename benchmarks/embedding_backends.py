@@ -0,0 +1,69 @@
+"""
+Compare the throughput of the embedding backends on a local model directory.
+
+Reports texts/s and batch latency per batch size for the sentence-transformers backend and the ONNX
+backends (fp32 and int8). Agreement of the ONNX embeddings with torch is checked in
+tests/test_embedding.py.
+
+Usage:
+    uv run python -m benchmarks.embedding_backends --model-dir data/models/paraphrase-multilingual-MiniLM-L12-v2
+"""
+
+import argparse
+import statistics
+import time
+
+from app.clients.embedding import OnnxBackend, SentenceTransformersBackend
+
+SENTENCES = [
+    "BigQuery is a serverless data warehouse.",
+    "Qdrant stores vectors together with a JSON payload.",
+    "The quick brown fox jumps over the lazy dog.",
+    "売上データを日別に集計するクエリを書いてください。",
+    "Wie viele Zeilen hat die Tabelle?",
+    "Un modèle d'embedding transforme un texte en vecteur.",
+    "short",
+    "A much longer document that goes on for a while to make sure that truncation and padding behave "
+    "the same way in every backend, even when the batch mixes short and long inputs together. " * 8,
+]
+
+
+def measure(backend, batch_size: int, repeats: int) -> tuple[float, float, float]:
+    """
+    Returns:
+        tuple: Throughput in texts/s, and p50 and p95 batch latency in milliseconds.
+    """
+    batch = (SENTENCES * (batch_size // len(SENTENCES) + 1))[:batch_size]
+    backend.encode(batch)  # warmup
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        backend.encode(batch)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return batch_size / statistics.mean(latencies), statistics.median(latencies) * 1000, p95 * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", required=True, help="Local sentence-transformers model directory")
+    parser.add_argument("--batch-sizes", default="1,8,32,128")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    backends = {
+        "torch-fp32": SentenceTransformersBackend(args.model_dir),
+        "onnx-fp32": OnnxBackend(args.model_dir, quantize=False),
+        "onnx-int8": OnnxBackend(args.model_dir, quantize=True),
+    }
+
+    print(f"{'backend':<12} {'batch':>6} {'texts/s':>10} {'p50 ms':>9} {'p95 ms':>9}")
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        for name, backend in backends.items():
+            throughput, p50, p95 = measure(backend, batch_size, args.repeats)
+            print(f"{name:<12} {batch_size:>6} {throughput:>10.1f} {p50:>9.2f} {p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
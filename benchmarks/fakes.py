@@ -0,0 +1,110 @@
+"""
+Local stand-ins for the external dependencies, for benchmarks that run offline.
+
+- FakeBigQueryClient: answers queries with generated rows, without network access.
+- HashEmbeddingBackend: deterministic embeddings derived from a hash of the text, registered as
+  the "hash" embedding provider.
+- SlowHashEmbeddingBackend: the same embeddings behind a simulated slow model load, registered as
+  the "slow-hash" embedding provider.
+
+Qdrant runs in qdrant-client's in-memory mode (`QdrantClient(":memory:")`).
+"""
+
+import datetime
+import hashlib
+import os
+import time
+import uuid
+from decimal import Decimal
+
+import numpy as np
+from google.cloud.bigquery import SchemaField, TableReference
+from google.cloud.bigquery.table import Row
+
+from app.clients.embedding import EmbeddingBackend, register_backend
+
+FAKE_SCHEMA = [
+    SchemaField("id", "INT64", mode="REQUIRED"),
+    SchemaField("name", "STRING"),
+    SchemaField("score", "FLOAT64"),
+    SchemaField("active", "BOOL"),
+    SchemaField("created_at", "TIMESTAMP"),
+    SchemaField("amount", "NUMERIC"),
+]
+
+
+class FakeQueryJob:
+    def __init__(self, rows: list[Row], dry_run: bool):
+        self.job_id = None if dry_run else str(uuid.uuid4())
+        self.dry_run = dry_run
+        self.statement_type = "SELECT"
+        self.referenced_tables = [TableReference.from_string("fake-project.analytics.events")]
+        self.total_bytes_processed = 1024 * len(rows)
+        self.total_bytes_billed = 0 if dry_run else 10 * 1024 * 1024
+        self._rows = rows
+
+    def result(self):
+        return FakeRowIterator(self._rows)
+
+
+class FakeRowIterator:
+    schema = FAKE_SCHEMA
+
+    def __init__(self, rows: list[Row]):
+        self._rows = rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class FakeBigQueryClient:
+    """
+    BigQuery client stand-in returning the same `row_count` generated rows for every query.
+
+    Only the parts of the client API used by the routers are implemented.
+    """
+
+    def __init__(self, row_count: int = 1000):
+        start = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+        field_to_index = {field.name: index for index, field in enumerate(FAKE_SCHEMA)}
+        self.rows = [
+            Row(
+                (i, f"customer-{i}", i / 7, i % 2 == 0, start + datetime.timedelta(minutes=i), Decimal(i) / 100),
+                field_to_index,
+            )
+            for i in range(row_count)
+        ]
+
+    def query(self, query: str, job_config=None) -> FakeQueryJob:
+        return FakeQueryJob(self.rows, dry_run=bool(job_config is not None and job_config.dry_run))
+
+
+@register_backend("hash")
+class HashEmbeddingBackend(EmbeddingBackend):
+    """
+    Deterministic embeddings from SHA-256 of the text. The model name is the vector size, e.g. "384".
+    """
+
+    def __init__(self, model_name: str):
+        super().__init__(model_name)
+        self.dimensions = int(model_name)
+
+    def encode(self, texts: list[str]) -> list[list[float]]:
+        vectors = np.empty((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            digest = hashlib.sha256(text.encode()).digest()
+            repeated = np.frombuffer(digest * (self.dimensions // len(digest) + 1), dtype=np.uint8)
+            vectors[row] = repeated[: self.dimensions] / 127.5 - 1.0
+        return vectors.tolist()
+
+
+@register_backend("slow-hash")
+class SlowHashEmbeddingBackend(HashEmbeddingBackend):
+    """
+    Hash embeddings that take FAKE_MODEL_LOAD_SECONDS (default 5) to load, standing in for importing
+    torch and reading the model weights.
+    """
+
+    def __init__(self, model_name: str):
+        time.sleep(float(os.getenv("FAKE_MODEL_LOAD_SECONDS", "5")))
+        super().__init__(model_name)
@@ -0,0 +1,122 @@
+"""
+Measure the response path of large query results: Pydantic model + jsonable_encoder + stdlib json
+(the former path) vs plain dicts rendered with orjson by FastJSONResponse.
+
+Rows are BigQuery `Row` objects with the value types the client returns (INT64, FLOAT64, STRING,
+BOOL, TIMESTAMP, DATE, NUMERIC, BYTES, NULL, REPEATED). The time covers row conversion, response
+building and serialization through the ASGI app. The responses of both paths are also compared;
+the only intended difference is BYTES, which are base64-encoded instead of decoded as UTF-8.
+
+Usage:
+    uv run python -m benchmarks.json_serialization --rows 10000,100000
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import time
+from decimal import Decimal
+
+import httpx
+from fastapi import FastAPI
+from google.cloud.bigquery.table import Row
+
+from app.responses import FastJSONResponse
+from app.schemas.bigquery import QueryResult, TableSchema
+
+FIELDS = ["id", "score", "name", "active", "created_at", "day", "amount", "payload", "note", "tags"]
+FIELD_TO_INDEX = {name: index for index, name in enumerate(FIELDS)}
+SCHEMAS = [TableSchema(name=name, type="STRING", mode="NULLABLE") for name in FIELDS]
+
+
+def make_rows(count: int) -> list[Row]:
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+    return [
+        Row(
+            (
+                i,
+                i / 7,
+                f"customer-{i}",
+                i % 2 == 0,
+                start + datetime.timedelta(seconds=i, microseconds=i % 1000),
+                (start + datetime.timedelta(days=i % 365)).date(),
+                Decimal(i) / 100,
+                f"blob-{i}".encode(),
+                None,
+                ["a", "b", str(i % 10)],
+            ),
+            FIELD_TO_INDEX,
+        )
+        for i in range(count)
+    ]
+
+
+def make_app(rows: list[Row]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/model", response_model=QueryResult)
+    def model_path():
+        converted = [dict(row.items()) for row in rows]
+        return QueryResult(
+            rows=converted, total_rows=len(converted), schemas=SCHEMAS, bytes_processed=0, gbytes_processed=0.0
+        )
+
+    @app.get("/fast", response_model=QueryResult)
+    def fast_path():
+        converted = [dict(zip(FIELDS, row, strict=True)) for row in rows]
+        return FastJSONResponse(
+            {
+                "rows": converted,
+                "total_rows": len(converted),
+                "schemas": SCHEMAS,
+                "bytes_processed": 0,
+                "gbytes_processed": 0.0,
+                "job_id": None,
+                "statement_type": None,
+                "referenced_tables": None,
+            }
+        )
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, repeat: int) -> tuple[float, bytes]:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = await client.get(path)
+            timings.append(time.perf_counter() - start)
+            response.raise_for_status()
+    return min(timings), response.content
+
+
+def compare(model_body: bytes, fast_body: bytes):
+    model, fast = json.loads(model_body), json.loads(fast_body)
+    for row in model["rows"] + fast["rows"]:
+        row.pop("payload")
+    if model != fast:
+        raise AssertionError("Responses differ beyond the BYTES encoding")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'model ms':>10} {'fast ms':>10} {'speedup':>8} {'MB':>7}")
+    for count in (int(value) for value in args.rows.split(",")):
+        app = make_app(make_rows(count))
+        model_time, model_body = asyncio.run(measure(app, "/model", args.repeat))
+        fast_time, fast_body = asyncio.run(measure(app, "/fast", args.repeat))
+        compare(model_body, fast_body)
+        print(
+            f"{count:>8} {model_time * 1000:>10.1f} {fast_time * 1000:>10.1f} {model_time / fast_time:>7.1f}x"
+            f" {len(fast_body) / 1e6:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Offline load test of the FastAPI app, through the REST routes and the MCP tool interface.
+
+External dependencies are replaced with local stand-ins on `app.state` (see benchmarks/fakes.py):
+Qdrant in memory, a fake BigQuery client and a deterministic hash embedder. Requests are
+dispatched in-process with httpx's ASGITransport; MCP tool calls go through the MCP server's
+tools/call handler, i.e. the path an MCP session takes after the transport.
+
+Each scenario runs --repeats times, each time in its own subprocess so its peak RSS is measured
+separately, and the median of every metric over the runs is reported. Results are compared
+against a stored baseline; the exit code is 1 if a scenario regressed by more than --tolerance in
+throughput, median latency or peak RSS, or by more than --tail-tolerance in p99 latency.
+
+Usage:
+    uv run python -m benchmarks.load_test
+    uv run python -m benchmarks.load_test --scenarios search-rest,search-mcp --requests 5000
+    uv run python -m benchmarks.load_test --update-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCENARIOS = ("ingest-rest", "ingest-mcp", "search-rest", "search-mcp", "query-rest", "thinking-rest", "thinking-mcp")
+BASELINE_PATH = Path(__file__).parent / "baselines" / "load_test.json"
+COLLECTION = "load_test"
+SEED_DOCUMENTS = 2000
+BATCH_SIZE = 16
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def _run_scenario(scenario: str, requests: int, concurrency: int, query_rows: int) -> dict:
+    # Stand-ins are configured before the app is imported; logging of every request is turned off
+    os.environ["LOG_LEVEL"] = "ERROR"
+    os.environ["BQ_ALLOWED_DATASETS"] = "*"
+
+    import httpx
+    from mcp import types
+    from qdrant_client import QdrantClient
+
+    from app.clients.embedding import EmbeddingClient
+    from app.clients.qdrant import InstrumentedQdrantClient
+    from app.clients.thought_store import InMemoryThoughtStore
+    from app.config.settings import EMBEDDING_SIZE
+    from app.main import app, mcp
+    from benchmarks.fakes import FakeBigQueryClient
+
+    app.state.bigquery_client = FakeBigQueryClient(query_rows)
+    app.state.qdrant_client = InstrumentedQdrantClient(QdrantClient(":memory:"))
+    app.state.thought_store = InMemoryThoughtStore()
+    app.state.embedding_client = EmbeddingClient(str(EMBEDDING_SIZE), "hash")
+    app.state.embedding_client.load()
+    app.state.mcp_transport.open()
+
+    call_tool_handler = mcp.server.request_handlers[types.CallToolRequest]
+
+    async def call_tool(name: str, arguments: dict):
+        request = types.CallToolRequest(
+            method="tools/call", params=types.CallToolRequestParams(name=name, arguments=arguments)
+        )
+        result = (await call_tool_handler(request)).root
+        if result.isError:
+            raise RuntimeError(result.content[0].text)
+
+    thought = {"thought": "Check the previous step against the requirements.", "next_thought_needed": True}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest") as client:
+
+        async def post(path: str, **kwargs):
+            response = await client.post(path, **kwargs)
+            response.raise_for_status()
+
+        operations = {
+            "ingest-rest": lambda i, worker: post(
+                f"/knowledge-base/{COLLECTION}/documents/batch",
+                json={"documents": [{"text": f"Document {i}-{j} about topic {j}."} for j in range(BATCH_SIZE)]},
+            ),
+            "ingest-mcp": lambda i, worker: call_tool(
+                "add_document",
+                {"collection_name": COLLECTION, "text": f"Document {i} about topic {i % 50}.", "metadata": {"i": i}},
+            ),
+            "search-rest": lambda i, worker: post(
+                f"/knowledge-base/{COLLECTION}/search", json={"query": f"topic {i % 100}", "limit": 10}
+            ),
+            "search-mcp": lambda i, worker: call_tool(
+                "search_documents", {"collection_name": COLLECTION, "query": f"topic {i % 100}", "limit": 10}
+            ),
+            "query-rest": lambda i, worker: post(
+                "/bigquery/query", json={"query": "SELECT * FROM analytics.events", "dry_run": False}
+            ),
+            "thinking-rest": lambda i, worker: post(
+                "/sequential-thinking/sequential-thinking",
+                json={**thought, "thought_number": i % 20 + 1, "total_thoughts": 20},
+                headers={"X-Session-ID": f"session-{worker}"},
+            ),
+            "thinking-mcp": lambda i, worker: call_tool(
+                "sequential_thinking",
+                {**thought, "thought_number": i % 20 + 1, "total_thoughts": 20, "x-session-id": f"session-{worker}"},
+            ),
+        }
+        operation = operations[scenario]
+
+        # Setup is not measured: the collection exists, and is seeded for the search scenarios
+        await post(f"/knowledge-base/collections/{COLLECTION}")
+        if scenario.startswith("search"):
+            for start in range(0, SEED_DOCUMENTS, 200):
+                documents = [{"text": f"Seed document {n} about topic {n % 100}."} for n in range(start, start + 200)]
+                await post(f"/knowledge-base/{COLLECTION}/documents/batch", json={"documents": documents})
+
+        for i in range(min(50, requests)):  # warmup
+            await operation(-i - 1, 0)
+
+        latencies: list[float] = []
+        errors = 0
+        counter = iter(range(requests))
+
+        async def worker(worker_id: int):
+            nonlocal errors
+            for i in counter:
+                start = time.perf_counter()
+                try:
+                    await operation(i, worker_id)
+                except Exception:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(worker_id) for worker_id in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "scenario": scenario,
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_scenario(scenario: str, requests: int, concurrency: int, query_rows: int, repeats: int) -> dict:
+    """
+    Run a scenario `repeats` times.
+
+    Returns:
+        dict: The median of every metric over the runs, and the total number of errors.
+    """
+    runs = []
+    for _ in range(repeats):
+        process = subprocess.run(
+            [sys.executable, "-m", "benchmarks.load_test", "--child", scenario, "--requests", str(requests)]
+            + ["--concurrency", str(concurrency), "--query-rows", str(query_rows)],
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode != 0:
+            raise RuntimeError(f"Scenario {scenario} failed:\n{process.stderr}")
+        runs.append(json.loads(process.stdout.strip().splitlines()[-1]))
+
+    result = {"scenario": scenario, "requests": requests, "runs": repeats, "errors": sum(run["errors"] for run in runs)}
+    for metric in ("rps", "p50_ms", "p95_ms", "p99_ms", "peak_rss_mb"):
+        result[metric] = statistics.median(run[metric] for run in runs)
+    return result
+
+
+def compare(result: dict, baseline: dict | None, tolerance: float, tail_tolerance: float) -> tuple[str, bool]:
+    """
+    Returns:
+        tuple: The change against the baseline as text, and whether the scenario regressed.
+    """
+    if baseline is None:
+        return "no baseline", False
+    rps_change = result["rps"] / baseline["rps"] - 1
+    p50_change = result["p50_ms"] / baseline["p50_ms"] - 1
+    p99_change = result["p99_ms"] / baseline["p99_ms"] - 1
+    rss_change = result["peak_rss_mb"] / baseline["peak_rss_mb"] - 1
+    regressed = (
+        rps_change < -tolerance
+        or p50_change > tolerance
+        or rss_change > tolerance
+        or p99_change > tail_tolerance
+        or result["errors"] > 0
+    )
+    text = f"rps {rps_change:+.0%}, p50 {p50_change:+.0%}, p99 {p99_change:+.0%}, rss {rss_change:+.0%}"
+    return text + (" REGRESSION" if regressed else ""), regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--query-rows", type=int, default=1000, help="Rows returned by the fake BigQuery client")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per scenario; the median is reported")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed relative regression of req/s, p50 and peak RSS"
+    )
+    parser.add_argument("--tail-tolerance", type=float, default=0.5, help="Allowed relative regression of p99")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = asyncio.run(_run_scenario(args.child, args.requests, args.concurrency, args.query_rows))
+        print(json.dumps(result))
+        return
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {"scenarios": {}}
+    config = {"requests": args.requests, "concurrency": args.concurrency, "query_rows": args.query_rows}
+    if baseline.get("config", config) != config and not args.update_baseline:
+        print(f"Warning: the baseline was recorded with {baseline['config']}, this run uses {config}\n")
+    results = {}
+    any_regressed = False
+    header = f"{'scenario':<14} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'rss MB':>8} {'errors':>6}"
+    print(f"{header}  vs baseline (median of {args.repeats} runs)")
+    for scenario in args.scenarios.split(","):
+        result = results[scenario] = run_scenario(
+            scenario, args.requests, args.concurrency, args.query_rows, args.repeats
+        )
+        change, regressed = compare(result, baseline["scenarios"].get(scenario), args.tolerance, args.tail_tolerance)
+        any_regressed |= regressed
+        print(
+            f"{scenario:<14} {result['rps']:>9.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}"
+            f" {result['p99_ms']:>8.2f} {result['peak_rss_mb']:>8.1f} {result['errors']:>6}  {change}"
+        )
+
+    if args.update_baseline:
+        baseline["config"] = config
+        baseline["scenarios"].update(results)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+    elif any_regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Measure the per-tool-call latency of the MCP bridge's HTTP client, in-process ASGI vs loopback HTTP.
+
+Both clients call the sequential thinking tool of an app served by uvicorn on a local port. The MCP
+server's own work is the same in both modes, so the difference is the latency saved per tool call.
+
+Usage:
+    uv run python -m benchmarks.mcp_transport --calls 2000
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import threading
+import time
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from app.clients.mcp import ToolTimeoutTransport
+from app.clients.thought_store import InMemoryThoughtStore
+from app.routers import sequential_thinking
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def measure(client: httpx.AsyncClient, calls: int) -> list[float]:
+    body = {
+        "thought": "Check the previous step.",
+        "next_thought_needed": True,
+        "thought_number": 1,
+        "total_thoughts": 3,
+    }
+    latencies = []
+    for i in range(calls + 50):
+        start = time.perf_counter()
+        response = await client.post("/sequential-thinking/sequential-thinking", json=body)
+        response.raise_for_status()
+        if i >= 50:  # warmup
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def run(calls: int, port: int, app: FastAPI):
+    transports = {
+        "asgi": ToolTimeoutTransport(lambda: httpx.ASGITransport(app=app), app, {}, 60, 100),
+        "http": ToolTimeoutTransport(httpx.AsyncHTTPTransport, app, {}, 60, 100),
+    }
+    for transport in transports.values():
+        transport.open()
+    clients = {
+        "asgi": httpx.AsyncClient(transport=transports["asgi"], base_url="http://apiserver"),
+        "http": httpx.AsyncClient(transport=transports["http"], base_url=f"http://127.0.0.1:{port}"),
+    }
+    print(f"{'transport':<10} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    results = {}
+    for name, client in clients.items():
+        async with client:
+            latencies = sorted(await measure(client, calls))
+        results[name] = statistics.mean(latencies)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{name:<10} {results[name] * 1000:>9.3f} {statistics.median(latencies) * 1000:>9.3f} {p99 * 1000:>9.3f}")
+    print(f"\nSaved per tool call: {(results['http'] - results['asgi']) * 1000:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    app = FastAPI()
+    app.include_router(sequential_thinking.router, prefix="/sequential-thinking")
+    app.state.thought_store = InMemoryThoughtStore()
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        asyncio.run(run(args.calls, port, app))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
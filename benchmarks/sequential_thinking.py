@@ -0,0 +1,133 @@
+"""
+Measure requests/sec of the sequential thinking endpoint per logging mode.
+
+Each mode runs in a subprocess whose stdout is a pipe drained by this process, like a container log pipe:
+
+- print:  synchronous rendering of every thought on the request path (the former `print(format_thought(...))`)
+- pretty: queue-backed logging, rendered on the logging thread
+- json:   queue-backed structured logging
+- off:    LOG_LEVEL=WARNING, thoughts are not logged
+
+The queue-backed modes drop records instead of blocking when the queue is full, so with a slow
+consumer part of their throughput comes from discarded logs; the number of dropped records is
+reported next to req/s.
+
+Usage:
+    uv run python -m benchmarks.sequential_thinking --requests 5000 --concurrency 32
+    uv run python -m benchmarks.sequential_thinking --drain-delay 0.001  # slow log consumer
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import subprocess
+import sys
+import threading
+import time
+
+MODES = ("print", "pretty", "json", "off")
+
+
+async def _run(mode: str, requests: int, concurrency: int) -> dict:
+    import httpx
+    from fastapi import FastAPI
+
+    from app.clients.thought_store import InMemoryThoughtStore
+    from app.config.logging import DeferredQueueHandler, PrettyFormatter, setup_logging
+    from app.routers import sequential_thinking
+
+    if mode == "print":
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(PrettyFormatter())
+        app_logger = logging.getLogger("app")
+        app_logger.addHandler(handler)
+        app_logger.setLevel(logging.INFO)
+    else:
+        setup_logging(level="WARNING" if mode == "off" else "INFO", log_format=mode)
+
+    app = FastAPI()
+    app.include_router(sequential_thinking.router, prefix="/sequential-thinking")
+    app.state.thought_store = InMemoryThoughtStore()
+
+    body = {
+        "thought": "Break the problem down and check each step against the previous one. " * 4,
+        "next_thought_needed": True,
+        "thought_number": 1,
+        "total_thoughts": 5,
+    }
+    counter = iter(range(requests))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def worker(session: int):
+            for i in counter:
+                response = await client.post(
+                    "/sequential-thinking/sequential-thinking",
+                    json={**body, "thought_number": i % 50 + 1},
+                    headers={"X-Session-ID": f"session-{session}"},
+                )
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(session) for session in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    # Records are dropped only while enqueuing, so the count is final once the requests are done
+    queue_handlers = [
+        handler for handler in logging.getLogger("app").handlers if isinstance(handler, DeferredQueueHandler)
+    ]
+    dropped = sum(handler.dropped for handler in queue_handlers)
+    return {"mode": mode, "requests": requests, "seconds": elapsed, "rps": requests / elapsed, "dropped": dropped}
+
+
+def _drain(pipe, delay: float):
+    while pipe.read1(4096):
+        time.sleep(delay)
+
+
+def run_mode(mode: str, requests: int, concurrency: int, drain_delay: float = 0.0) -> dict:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.sequential_thinking", "--child", mode, "--requests", str(requests)]
+        + ["--concurrency", str(concurrency)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    # Drain the log pipe in the background, as a container runtime would
+    drain = threading.Thread(target=_drain, args=(process.stdout, drain_delay))
+    drain.start()
+    stderr = process.stderr.read()
+    process.wait()
+    drain.join()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode())
+    return json.loads(stderr.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument(
+        "--drain-delay",
+        type=float,
+        default=0.0,
+        help="Seconds to sleep per 4 KiB read from the log pipe (slow consumer)",
+    )
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = asyncio.run(_run(args.child, args.requests, args.concurrency))
+        print(json.dumps(result), file=sys.stderr)
+        return
+
+    print(f"{'mode':<8} {'req/s':>10} {'dropped logs':>13}")
+    for mode in args.modes.split(","):
+        result = run_mode(mode, args.requests, args.concurrency, args.drain_delay)
+        print(f"{mode:<8} {result['rps']:>10.1f} {result['dropped']:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Compare per-worker model copies with the shared embedding server.
+
+Starts N worker processes that each embed single texts in a loop (like search queries):
+
+- local:  every worker loads its own copy of the model (the default deployment)
+- remote: one `app.embedding_server` process holds the model; workers use the "remote" provider
+
+Reports the resident memory of every process and the total embeddings/s. RSS is read from
+/proc, so memory figures need Linux.
+
+Usage:
+    uv run python -m benchmarks.shared_embedding --workers 4 --seconds 10
+    uv run python -m benchmarks.shared_embedding --provider onnx --model data/models/paraphrase-multilingual-MiniLM-L12-v2
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.config.settings import EMBEDDING_MODEL, EMBEDDING_SERVER_PROVIDER
+
+TEXTS = [f"How do I configure the retention policy for dataset number {i}?" for i in range(256)]
+
+
+def rss_mb(pid: int | str = "self") -> float | None:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def run_worker(provider: str, model: str, seconds: float):
+    from app.clients.embedding import EmbeddingClient
+
+    embedding_client = EmbeddingClient(model, provider)
+    embedding_client.load()
+    if embedding_client.status != "ready":
+        raise SystemExit(embedding_client.error)
+    # The remote backend connects on its first request, which waits for the server to load the model
+    embedding_client.embed("ready")
+
+    # Wait for the other workers, so all of them run at the same time
+    print("ready", flush=True)
+    sys.stdin.readline()
+
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        embedding_client.embed(TEXTS[count % len(TEXTS)])
+        count += 1
+    print(json.dumps({"count": count, "rss_mb": rss_mb()}), flush=True)
+
+
+def run_mode(mode: str, provider: str, model: str, workers: int, seconds: float) -> dict:
+    env = dict(os.environ)
+    server = None
+    if mode == "remote":
+        socket_path = os.path.join(tempfile.mkdtemp(), "embedding.sock")
+        env["EMBEDDING_SERVER_SOCKET"] = socket_path
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app.embedding_server", "--provider", provider, "--model", model],
+            env=env,
+            stdout=subprocess.DEVNULL,
+        )
+        provider = "remote"
+
+    start = time.perf_counter()
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.shared_embedding", "--child", provider, "--model", model]
+            + ["--seconds", str(seconds)],
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(workers)
+    ]
+    try:
+        for process in processes:
+            if process.stdout.readline().strip() != "ready":
+                raise RuntimeError("Worker failed to load the embedding model")
+        ready_seconds = time.perf_counter() - start
+        for process in processes:
+            process.stdin.write("go\n")
+            process.stdin.flush()
+        results = [json.loads(process.stdout.readline()) for process in processes]
+        server_rss = rss_mb(server.pid) if server is not None else None
+    except BaseException:
+        # e.g. a worker was killed for running out of memory; the others would wait forever
+        for process in processes:
+            process.kill()
+        raise
+    finally:
+        for process in processes:
+            process.wait()
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    worker_rss = [result["rss_mb"] for result in results]
+    return {
+        "mode": mode,
+        "ready_seconds": ready_seconds,
+        "embeddings_per_second": sum(result["count"] for result in results) / seconds,
+        "worker_rss_mb": sum(worker_rss) / len(worker_rss) if None not in worker_rss else None,
+        "server_rss_mb": server_rss,
+        "total_rss_mb": sum(worker_rss) + (server_rss or 0) if None not in worker_rss else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", default=EMBEDDING_SERVER_PROVIDER)
+    parser.add_argument("--model", default=EMBEDDING_MODEL)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--modes", default="local,remote")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_worker(args.child, args.model, args.seconds)
+        return
+
+    def fmt(value: float | None) -> str:
+        return f"{value:.1f}" if value is not None else "n/a"
+
+    print(f"{args.workers} workers, {args.provider}: {args.model}\n")
+    print(f"{'mode':<8} {'ready s':>8} {'emb/s':>9} {'worker MB':>10} {'server MB':>10} {'total MB':>9}")
+    for mode in args.modes.split(","):
+        result = run_mode(mode, args.provider, args.model, args.workers, args.seconds)
+        print(
+            f"{mode:<8} {result['ready_seconds']:>8.1f} {result['embeddings_per_second']:>9.1f}"
+            f" {fmt(result['worker_rss_mb']):>10} {fmt(result['server_rss_mb']):>10} {fmt(result['total_rss_mb']):>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
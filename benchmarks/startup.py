@@ -0,0 +1,116 @@
+"""
+Measure time-to-first-request of the application.
+
+Starts uvicorn in a subprocess and polls the health endpoints, once with the embedding model loaded
+in the background (EMBEDDING_LAZY_LOAD=true) and once with the blocking load used before lazy loading.
+
+With --fake-model-load SECONDS, the configured model is replaced by the "slow-hash" stand-in from
+benchmarks/fakes.py, which sleeps for that long while loading. This measures startup offline,
+without torch or a downloaded model.
+
+Usage:
+    uv run python -m benchmarks.startup --runs 3
+    uv run python -m benchmarks.startup --fake-model-load 8
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.config.settings import EMBEDDING_SIZE
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def create_app():
+    """
+    uvicorn app factory that registers the stand-in backends before returning the app.
+    """
+    import benchmarks.fakes  # noqa: F401
+    from app.main import app
+
+    return app
+
+
+def measure_startup(
+    lazy_load: bool, timeout: float, fake_model_load: float | None = None
+) -> tuple[float, float | None]:
+    """
+    Returns:
+        tuple: Seconds until /health/health answered, and seconds until the embedding model was ready
+        (None if it failed to load or did not load within the timeout).
+    """
+    port = _free_port()
+    env = {**os.environ, "EMBEDDING_LAZY_LOAD": str(lazy_load).lower()}
+    target = ["app.main:app"]
+    if fake_model_load is not None:
+        env.update(
+            EMBEDDING_MODEL_PROVIDER="slow-hash",
+            EMBEDDING_MODEL=str(EMBEDDING_SIZE),
+            FAKE_MODEL_LOAD_SECONDS=str(fake_model_load),
+        )
+        target = ["--factory", "benchmarks.startup:create_app"]
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", *target, "--host", "127.0.0.1", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    first_request = None
+    model_ready = None
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1.0) as client:
+            while time.perf_counter() - start < timeout:
+                try:
+                    if first_request is None:
+                        client.get("/health/health").raise_for_status()
+                        first_request = time.perf_counter() - start
+                    embedding_status = client.get("/health/ready").json()["subsystems"]["embedding"]["status"]
+                    if embedding_status == "ready":
+                        model_ready = time.perf_counter() - start
+                        break
+                    if embedding_status == "failed":
+                        break
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.05)
+    finally:
+        process.terminate()
+        process.wait()
+
+    if first_request is None:
+        raise RuntimeError(f"Application did not start within {timeout}s")
+    return first_request, model_ready
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument(
+        "--fake-model-load", type=float, help="Use a stand-in model that takes this many seconds to load"
+    )
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'first request (s)':>18} {'model ready (s)':>16}")
+    for lazy_load in (False, True):
+        results = [measure_startup(lazy_load, args.timeout, args.fake_model_load) for _ in range(args.runs)]
+        first_request = statistics.median(r[0] for r in results)
+        ready = [r[1] for r in results if r[1] is not None]
+        model_ready = f"{statistics.median(ready):.2f}" if ready else "n/a"
+        print(f"{'lazy' if lazy_load else 'blocking':<10} {first_request:>18.2f} {model_ready:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Write a synthetic ONNX embedding model for memory and throughput benchmarks without downloads.
+
+The model has the size of paraphrase-multilingual-MiniLM-L12-v2's largest part, a 250k x 384
+token embedding table, followed by a feed-forward block. Its output means nothing, but loading
+and running it costs memory and CPU comparable to the real model. The directory (a
+`tokenizer.json` and `onnx/model.onnx`) is used with the "onnx" provider and
+EMBEDDING_ONNX_QUANTIZE=false.
+
+Usage:
+    uv run --extra onnx python -m benchmarks.synthetic_model data/models/synthetic-minilm
+    EMBEDDING_ONNX_QUANTIZE=false uv run --extra onnx python -m benchmarks.shared_embedding \
+        --provider onnx --model data/models/synthetic-minilm
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+
+def write_synthetic_model(model_dir: Path, vocab_size: int = 250000, dimension: int = 384, hidden: int = 1536):
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+    from tokenizers import Tokenizer, models, pre_tokenizers
+
+    rng = np.random.default_rng(0)
+    weights = [
+        numpy_helper.from_array(rng.standard_normal((vocab_size, dimension), dtype=np.float32) * 0.1, "embeddings"),
+        numpy_helper.from_array(rng.standard_normal((dimension, hidden), dtype=np.float32) * 0.05, "w1"),
+        numpy_helper.from_array(rng.standard_normal((hidden, dimension), dtype=np.float32) * 0.05, "w2"),
+    ]
+    nodes = [
+        helper.make_node("Gather", ["embeddings", "input_ids"], ["h0"]),
+        helper.make_node("MatMul", ["h0", "w1"], ["h1"]),
+        helper.make_node("Relu", ["h1"], ["h2"]),
+        helper.make_node("MatMul", ["h2", "w2"], ["token_embeddings"]),
+    ]
+    graph = helper.make_graph(
+        nodes,
+        "synthetic-embedding",
+        [helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "sequence"])],
+        [helper.make_tensor_value_info("token_embeddings", TensorProto.FLOAT, ["batch", "sequence", dimension])],
+        weights,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 10
+    (model_dir / "onnx").mkdir(parents=True, exist_ok=True)
+    onnx.save(model, str(model_dir / "onnx" / "model.onnx"))
+
+    vocab = {f"w{i}": i for i in range(vocab_size - 1)}
+    vocab["[UNK]"] = vocab_size - 1
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.save(str(model_dir / "tokenizer.json"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("model_dir", type=Path)
+    parser.add_argument("--vocab-size", type=int, default=250000)
+    parser.add_argument("--dimension", type=int, default=384)
+    args = parser.parse_args()
+
+    write_synthetic_model(args.model_dir, args.vocab_size, args.dimension)
+    print(f"Synthetic model written to {args.model_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from app.clients.embedding import get_embedding_client
+from app.clients.qdrant import CollectionCache, collection_cache
+from app.config.settings import EMBEDDING_SIZE
+from app.routers.knowledge_base import collections, documents, transfer
+
+
+class StubEmbeddingClient:
+    def embed(self, text: str) -> list[float]:
+        return [1.0] + [0.0] * (EMBEDDING_SIZE - 1)
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed(text) for text in texts]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Long enough that only an invalidation can refresh the listing during a test
+    monkeypatch.setattr(collection_cache, "ttl", 3600.0)
+    collection_cache.invalidate()
+    app = FastAPI()
+    for router in (collections.router, documents.router, transfer.router):
+        app.include_router(router, prefix="/knowledge-base")
+    app.dependency_overrides[get_embedding_client] = StubEmbeddingClient
+    app.state.qdrant_client = QdrantClient(":memory:")
+    yield TestClient(app)
+    collection_cache.invalidate()
+
+
+def document_counts(client: TestClient) -> dict[str, int]:
+    response = client.get("/knowledge-base/collections")
+    assert response.status_code == 200, response.text
+    return {collection["name"]: collection["document_count"] for collection in response.json()}
+
+
+def test_collection_listing_is_cached(client):
+    assert client.post("/knowledge-base/collections/docs").status_code == 200
+    assert document_counts(client) == {"docs": 0}
+
+    # A write that bypasses the routes is not seen until the cache expires
+    client.app.state.qdrant_client.upsert(
+        "docs", points=[models.PointStruct(id=1, vector=StubEmbeddingClient().embed("x"))]
+    )
+    assert document_counts(client) == {"docs": 0}
+
+
+def test_writes_invalidate_the_collection_listing(client):
+    assert client.post("/knowledge-base/collections/docs").status_code == 200
+    assert document_counts(client) == {"docs": 0}
+
+    added = client.post("/knowledge-base/docs/documents", json={"text": "first"})
+    assert added.status_code == 200
+    assert document_counts(client) == {"docs": 1}
+
+    batch = client.post("/knowledge-base/docs/documents/batch", json={"documents": [{"text": "a"}, {"text": "b"}]})
+    assert batch.status_code == 200
+    assert document_counts(client) == {"docs": 3}
+
+    document_id = batch.json()["ids"][0]
+    assert client.delete(f"/knowledge-base/docs/documents/{document_id}").status_code == 200
+    assert document_counts(client) == {"docs": 2}
+
+    exported = client.get("/knowledge-base/collections/docs/export")
+    assert client.post("/knowledge-base/collections/copy/import", content=exported.content).status_code == 200
+    assert document_counts(client) == {"docs": 2, "copy": 2}
+
+    assert client.delete("/knowledge-base/collections/docs").status_code == 200
+    assert document_counts(client) == {"copy": 2}
+
+
+def test_value_computed_across_an_invalidation_is_not_cached():
+    cache = CollectionCache("test", ttl=3600.0)
+    generation = cache.generation
+    cache.invalidate()
+
+    cache.set(["stale"], generation)
+
+    assert cache.get() is None
+    cache.set(["fresh"], cache.generation)
+    assert cache.get() == ["fresh"]
@@ -0,0 +1,145 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from app.clients.embedding import get_embedding_client
+from app.routers.knowledge_base import documents
+
+
+class StubEmbeddingClient:
+    def __init__(self):
+        self.embedded: list[str] = []
+
+    def embed(self, text: str) -> list[float]:
+        return [1.0, 0.0, 0.0, 0.0]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return [[1.0, float(len(text)), 0.0, 0.0] for text in texts]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(documents.router, prefix="/knowledge-base")
+    app.dependency_overrides[get_embedding_client] = StubEmbeddingClient
+    app.state.qdrant_client = QdrantClient(":memory:")
+    app.state.qdrant_client.create_collection(
+        "docs", vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE)
+    )
+    app.state.qdrant_client.upsert(
+        "docs",
+        points=[
+            models.PointStruct(id=1, vector=[1.0, 0.0, 0.0, 0.0], payload={"text": "no metadata"}),
+            models.PointStruct(
+                id=2, vector=[1.0, 0.1, 0.0, 0.0], payload={"text": "with metadata", "metadata": {"lang": "en"}}
+            ),
+        ],
+    )
+    return TestClient(app)
+
+
+def search(client: TestClient, **request) -> list[dict]:
+    response = client.post("/knowledge-base/docs/search", json={"query": "anything", **request})
+    assert response.status_code == 200, response.text
+    return response.json()["results"]
+
+
+def test_search_returns_full_documents_by_default(client):
+    results = search(client)
+
+    assert [(result["text"], result["metadata"]) for result in results] == [
+        ("no metadata", {}),
+        ("with metadata", {"lang": "en"}),
+    ]
+
+
+def test_search_with_payload_projection(client):
+    results = search(client, with_payload=["metadata.lang"])
+
+    assert [set(result) for result in results] == [{"id", "score"}, {"id", "metadata", "score"}]
+    assert results[1]["metadata"] == {"lang": "en"}
+
+
+def test_search_ids_only(client):
+    assert [set(result) for result in search(client, ids_only=True)] == [{"id", "score"}] * 2
+
+
+def test_search_rejects_empty_payload_projection(client):
+    response = client.post("/knowledge-base/docs/search", json={"query": "anything", "with_payload": []})
+
+    assert response.status_code == 422
+
+
+def add_batch(client: TestClient, texts: list[str], **options) -> dict:
+    documents = [{"text": text} for text in texts]
+    response = client.post("/knowledge-base/docs/documents/batch", json={"documents": documents, **options})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_add_documents_deduplicates_within_the_batch(client):
+    embedding_client = StubEmbeddingClient()
+    client.app.dependency_overrides[get_embedding_client] = lambda: embedding_client
+
+    result = add_batch(client, ["first", "second", "first", "  first "])
+
+    assert (result["added"], result["skipped"]) == (2, 2)
+    assert result["ids"][0] == result["ids"][2] == result["ids"][3] != result["ids"][1]
+    assert embedding_client.embedded == ["first", "second"]
+
+
+def test_add_documents_skips_existing_documents(client):
+    embedding_client = StubEmbeddingClient()
+    client.app.dependency_overrides[get_embedding_client] = lambda: embedding_client
+    first = add_batch(client, ["first", "second"])
+
+    again = add_batch(client, ["second", "third"])
+
+    assert (again["added"], again["skipped"]) == (1, 1)
+    assert again["ids"][0] == first["ids"][1]
+    assert embedding_client.embedded == ["first", "second", "third"]
+    assert client.app.state.qdrant_client.count("docs").count == 2 + 3
+
+
+def test_add_documents_without_skip_existing_re_embeds(client):
+    embedding_client = StubEmbeddingClient()
+    client.app.dependency_overrides[get_embedding_client] = lambda: embedding_client
+    add_batch(client, ["first"])
+
+    again = add_batch(client, ["first", "first"], skip_existing=False)
+
+    assert (again["added"], again["skipped"]) == (1, 1)
+    assert embedding_client.embedded == ["first", "first"]
+    assert client.app.state.qdrant_client.count("docs").count == 2 + 1
+
+
+class SlowEmbeddingClient(StubEmbeddingClient):
+    def embed(self, text: str) -> list[float]:
+        time.sleep(0.2)  # blocking, like a round trip to the embedding server
+        return super().embed(text)
+
+
+def test_embedding_does_not_block_the_event_loop(client):
+    client.app.dependency_overrides[get_embedding_client] = SlowEmbeddingClient
+
+    async def run():
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            start = time.perf_counter()
+            responses = await asyncio.gather(
+                *(http.post("/knowledge-base/docs/search", json={"query": f"query {i}"}) for i in range(4))
+            )
+            return time.perf_counter() - start, responses
+
+    elapsed, responses = asyncio.run(run())
+
+    assert [response.status_code for response in responses] == [200] * 4
+    # Sequential embedding on the event loop would take 4 x 0.2 s
+    assert elapsed < 0.6
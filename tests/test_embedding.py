@@ -0,0 +1,123 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.clients.embedding import OnnxBackend, SentenceTransformersBackend
+
+SENTENCES = [
+    "bigquery is a data warehouse",
+    "qdrant stores vectors",
+    "the quick brown fox jumps over the lazy dog",
+    "short",
+    "a longer sentence about vectors and tables that gets truncated " * 4,
+]
+
+
+class StubTokenizer:
+    def __init__(self, attention_masks: list[list[int]]):
+        self.attention_masks = attention_masks
+
+    def encode_batch(self, texts: list[str]):
+        return [
+            SimpleNamespace(ids=[1] * len(mask), attention_mask=mask, type_ids=[0] * len(mask))
+            for mask in self.attention_masks[: len(texts)]
+        ]
+
+
+class StubSession:
+    def __init__(self, token_embeddings: np.ndarray):
+        self.token_embeddings = token_embeddings
+        self.inputs = None
+
+    def run(self, output_names, inputs):
+        self.inputs = inputs
+        return [self.token_embeddings]
+
+
+def stub_backend(token_embeddings, attention_masks, pooling_mode="mean", normalize=False) -> OnnxBackend:
+    backend = OnnxBackend.__new__(OnnxBackend)
+    backend.tokenizer = StubTokenizer(attention_masks)
+    backend.session = StubSession(np.asarray(token_embeddings, dtype=np.float32))
+    backend.input_names = {"input_ids", "attention_mask"}
+    backend.pooling_mode = pooling_mode
+    backend.normalize = normalize
+    return backend
+
+
+TOKEN_EMBEDDINGS = [
+    [[1.0, 2.0], [3.0, 4.0], [100.0, 100.0]],
+    [[2.0, 0.0], [0.0, 0.0], [0.0, 0.0]],
+]
+ATTENTION_MASKS = [[1, 1, 0], [1, 0, 0]]
+
+
+def test_onnx_mean_pooling_ignores_padding():
+    backend = stub_backend(TOKEN_EMBEDDINGS, ATTENTION_MASKS)
+
+    embeddings = backend.encode(["a b", "c"])
+
+    assert embeddings == [[2.0, 3.0], [2.0, 0.0]]
+    # Only the inputs the model declares are passed
+    assert set(backend.session.inputs) == {"input_ids", "attention_mask"}
+
+
+def test_onnx_cls_pooling_takes_first_token():
+    backend = stub_backend(TOKEN_EMBEDDINGS, ATTENTION_MASKS, pooling_mode="cls")
+
+    assert backend.encode(["a b", "c"]) == [[1.0, 2.0], [2.0, 0.0]]
+
+
+def test_onnx_normalize():
+    backend = stub_backend([[[3.0, 4.0]], [[0.0, 0.0]]], [[1], [1]], normalize=True)
+
+    embeddings = backend.encode(["a", "b"])
+
+    np.testing.assert_allclose(embeddings, [[0.6, 0.8], [0.0, 0.0]])
+
+
+@pytest.fixture(scope="module")
+def tiny_model_dir(tmp_path_factory):
+    """
+    A randomly initialized two-layer BERT saved as a sentence-transformers model (mean pooling, normalized).
+    """
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    sentence_transformers = pytest.importorskip("sentence_transformers")
+
+    hf_dir = tmp_path_factory.mktemp("tiny-bert")
+    words = sorted({word for sentence in SENTENCES for word in sentence.split()})
+    (hf_dir / "vocab.txt").write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *words]))
+    transformers.BertTokenizerFast(vocab_file=str(hf_dir / "vocab.txt")).save_pretrained(hf_dir)
+    config = transformers.BertConfig(
+        vocab_size=len(words) + 5,
+        hidden_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        intermediate_size=128,
+        max_position_embeddings=64,
+    )
+    torch.manual_seed(0)
+    transformers.BertModel(config).save_pretrained(hf_dir)
+
+    model_dir = tmp_path_factory.mktemp("tiny-model")
+    models = sentence_transformers.models
+    transformer = models.Transformer(str(hf_dir), max_seq_length=32)
+    sentence_transformers.SentenceTransformer(
+        modules=[transformer, models.Pooling(transformer.get_word_embedding_dimension(), "mean"), models.Normalize()],
+        device="cpu",
+    ).save(str(model_dir))
+    return model_dir
+
+
+@pytest.mark.parametrize("quantize", [False, True], ids=["fp32", "int8"])
+def test_onnx_backend_agrees_with_torch(tiny_model_dir, quantize):
+    pytest.importorskip("onnxruntime")
+
+    reference = np.asarray(SentenceTransformersBackend(str(tiny_model_dir)).encode(SENTENCES))
+    candidate = np.asarray(OnnxBackend(str(tiny_model_dir), quantize=quantize).encode(SENTENCES))
+
+    cosine = (reference * candidate).sum(axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    )
+    assert cosine.min() >= 0.98
@@ -0,0 +1,138 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import os
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+from app.clients.embedding import (
+    REQUEST_HEADER,
+    RESPONSE_HEADER,
+    EmbeddingClient,
+    RemoteEmbeddingBackend,
+    recv_exactly,
+)
+from app.embedding_server import EmbeddingServer
+
+
+class StubEmbeddingClient:
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to about 100 characters, which tmp_path may exceed
+    path = f"/tmp/embedding-test-{os.getpid()}-{time.monotonic_ns()}.sock"
+    yield path
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+
+@contextlib.contextmanager
+def running_server(socket_path: str):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = asyncio.run_coroutine_threadsafe(EmbeddingServer(StubEmbeddingClient()).serve(socket_path), loop)
+    try:
+        while not os.path.exists(socket_path):
+            time.sleep(0.01)
+        yield
+    finally:
+        server.cancel()
+        concurrent.futures.wait([server], timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def test_remote_backend_round_trip(socket_path):
+    with running_server(socket_path):
+        backend = RemoteEmbeddingBackend("ignored", socket_path=socket_path)
+
+        assert backend.encode(["a", "abc"]) == [[1.0, 1.0], [3.0, 1.0]]
+        assert backend.encode([]) == []
+        backend._local.sock.close()
+
+
+def test_remote_backend_connects_lazily(socket_path):
+    backend = RemoteEmbeddingBackend("ignored", socket_path=socket_path, connect_timeout=0.0)
+    with pytest.raises(ConnectionError, match="not available"):
+        backend.encode(["before the server is up"])
+
+    with running_server(socket_path):
+        assert backend.encode(["ab"]) == [[2.0, 1.0]]
+        backend._local.sock.close()
+
+
+def test_remote_client_loads_without_the_server():
+    embedding_client = EmbeddingClient("ignored", "remote")
+
+    embedding_client.load()
+
+    assert embedding_client.status == "ready"
+
+
+def test_remote_backend_times_out_and_drops_the_connection(socket_path):
+    # Accepts connections but never answers, like a hung server
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen()
+    try:
+        backend = RemoteEmbeddingBackend("ignored", socket_path=socket_path, request_timeout=0.2)
+
+        start = time.monotonic()
+        with pytest.raises(TimeoutError, match="did not respond within 0.2s"):
+            backend.encode(["never answered"])
+
+        assert time.monotonic() - start < 2
+        assert backend._local.sock is None
+    finally:
+        listener.close()
+
+
+def request(sock: socket.socket, payload: bytes) -> tuple[int, bytes]:
+    sock.sendall(REQUEST_HEADER.pack(len(payload)) + payload)
+    rows, size = RESPONSE_HEADER.unpack(recv_exactly(sock, RESPONSE_HEADER.size))
+    return rows, recv_exactly(sock, size * 4 if rows > 0 else size)
+
+
+@pytest.mark.parametrize("payload", [b"not json", b'"a string"', b'{"texts": ["a"]}', b'["a", 1]', b"\xff"])
+def test_server_rejects_invalid_payloads_and_keeps_the_connection(socket_path, payload):
+    with running_server(socket_path), socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(socket_path)
+
+        rows, message = request(sock, payload)
+        assert rows == -1
+        assert message
+
+        rows, vectors = request(sock, b'["abc"]')
+        assert rows == 1
+        assert vectors == struct.pack("<2f", 3.0, 1.0)
+
+
+def test_server_replaces_a_stale_socket(socket_path):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+
+    with running_server(socket_path):
+        backend = RemoteEmbeddingBackend("ignored", socket_path=socket_path)
+        assert backend.encode(["a"]) == [[1.0, 1.0]]
+        backend._local.sock.close()
+
+
+def test_server_does_not_remove_other_files(tmp_path):
+    path = tmp_path / "not-a-socket"
+    path.write_text("keep me")
+
+    with pytest.raises(FileExistsError, match="is not a socket"):
+        asyncio.run(EmbeddingServer(StubEmbeddingClient()).serve(str(path)))
+
+    assert path.read_text() == "keep me"
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.health import HealthMonitor
+from app.routers import health
+
+
+class StubBigQueryClient:
+    def query(self, query, job_config=None):
+        return None
+
+
+class StubQdrantClient:
+    def __init__(self, error: Exception | None = None, hang: threading.Event | None = None):
+        self.error = error
+        self.hang = hang
+        self.calls = 0
+
+    def get_collections(self):
+        self.calls += 1
+        if self.hang is not None:
+            self.hang.wait()
+        if self.error is not None:
+            raise self.error
+
+
+class StubEmbeddingClient:
+    def __init__(self, status: str = "ready"):
+        self.status = status
+        self.error = None
+        self.model = SimpleNamespace(encode=lambda texts: [[0.0] for _ in texts])
+
+
+def make_state(**clients) -> SimpleNamespace:
+    defaults = {
+        "bigquery_client": StubBigQueryClient(),
+        "qdrant_client": StubQdrantClient(),
+        "embedding_client": StubEmbeddingClient(),
+    }
+    return SimpleNamespace(**{**defaults, **clients})
+
+
+@pytest.fixture
+def hang():
+    event = threading.Event()
+    yield event
+    event.set()  # release the probe thread
+
+
+def test_hanging_probe_times_out_and_is_not_restarted(hang):
+    qdrant_client = StubQdrantClient(hang=hang)
+    monitor = HealthMonitor(make_state(qdrant_client=qdrant_client), timeout=0.05)
+
+    async def run():
+        await monitor.check()
+        first = monitor.results["qdrant"]
+        await monitor.check()
+        return first
+
+    first = asyncio.run(run())
+
+    assert first["status"] == "failed"
+    assert first["error"] == "Probe timed out after 0.05s"
+    assert monitor.results["bigquery"]["status"] == "ready"
+    assert monitor.results["embedding"]["status"] == "ready"
+    # The second round skipped the probe that was still hanging
+    assert qdrant_client.calls == 1
+
+
+def make_client(monitor: HealthMonitor) -> TestClient:
+    app = FastAPI()
+    app.include_router(health.router, prefix="/health")
+    app.state.health_monitor = monitor
+    return TestClient(app)
+
+
+def test_ready_reports_a_failed_dependency():
+    monitor = HealthMonitor(make_state(qdrant_client=StubQdrantClient(error=ConnectionError("connection refused"))))
+    asyncio.run(monitor.check())
+    client = make_client(monitor)
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "degraded"
+    assert body["subsystems"]["qdrant"]["status"] == "failed"
+    assert body["subsystems"]["qdrant"]["error"] == "connection refused"
+    assert body["subsystems"]["bigquery"]["status"] == "ready"
+    assert client.get("/health/ready", params={"strict": True}).status_code == 503
+
+
+def test_ready_reads_the_cached_results():
+    qdrant_client = StubQdrantClient()
+    monitor = HealthMonitor(make_state(qdrant_client=qdrant_client))
+    asyncio.run(monitor.check())
+    client = make_client(monitor)
+
+    for _ in range(3):
+        response = client.get("/health/ready", params={"strict": True})
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+    assert qdrant_client.calls == 1
+
+
+def test_ready_follows_the_model_loading_state():
+    embedding_client = StubEmbeddingClient(status="loading")
+    monitor = HealthMonitor(make_state(embedding_client=embedding_client))
+    asyncio.run(monitor.check())
+    client = make_client(monitor)
+
+    assert client.get("/health/ready").json()["status"] == "starting"
+    embedding_client.status = "ready"
+    assert client.get("/health/ready").json()["subsystems"]["embedding"] == {"status": "ready"}
@@ -0,0 +1,23 @@
+import logging
+import queue
+
+from app.config.logging import DeferredQueueHandler
+from app.metrics import LOG_RECORDS_DROPPED, render_metrics
+
+
+def dropped_total() -> float:
+    [sample] = LOG_RECORDS_DROPPED.samples()
+    return float(sample.split()[-1])
+
+
+def test_full_queue_drops_and_counts_records():
+    handler = DeferredQueueHandler(queue.Queue(maxsize=2))
+    before = dropped_total()
+
+    for i in range(5):
+        handler.handle(logging.LogRecord("app.test", logging.INFO, __file__, 1, f"record {i}", None, None))
+
+    assert handler.dropped == 3
+    assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == ["record 0", "record 1"]
+    assert dropped_total() == before + 3
+    assert "# TYPE app_log_records_dropped_total counter" in render_metrics()
@@ -0,0 +1,16 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.clients.embedding import EmbeddingClient
+
+
+def test_blocking_startup_fails_if_the_model_does_not_load(monkeypatch):
+    monkeypatch.setattr(main, "init_bigquery_client", lambda: None)
+    monkeypatch.setattr(main, "init_qdrant_client", lambda: None)
+    monkeypatch.setattr(main, "EMBEDDING_LAZY_LOAD", False)
+    monkeypatch.setattr(main, "EmbeddingClient", lambda: EmbeddingClient("model", "unknown"))
+
+    with pytest.raises(RuntimeError, match="Unsupported embedding model provider"):
+        with TestClient(main.app):
+            pass
@@ -0,0 +1,103 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.clients.mcp import ToolTimeoutTransport
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/items/{item_id}", operation_id="update_item")
+    def update_item(item_id: int):
+        return {}
+
+    @app.get("/items/{item_id}", operation_id="get_item")
+    def get_item(item_id: int):
+        return {}
+
+    return app
+
+
+class StubTransport(httpx.AsyncBaseTransport):
+    """Answers after `delay` seconds and records the peak number of concurrent requests."""
+
+    def __init__(self, delay: float = 0.0, stream: httpx.AsyncByteStream | None = None):
+        self.delay = delay
+        self.stream = stream
+        self.active = 0
+        self.peak = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if self.stream is not None:
+            return httpx.Response(200, stream=self.stream)
+        return httpx.Response(200, json={"ok": True})
+
+
+class StalledStream(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        yield b'{"ok": '
+        await asyncio.sleep(3600)
+
+
+def make_transport(inner: StubTransport, timeouts: dict[str, float], max_concurrency: int = 10):
+    transport = ToolTimeoutTransport(lambda: inner, make_app(), timeouts, 60.0, max_concurrency)
+    transport.open()
+    return transport
+
+
+def test_timeout_is_looked_up_by_operation_id():
+    transport = make_transport(StubTransport(), {"update_item": 5.0, "unknown": 1.0})
+
+    assert transport._timeout_for(httpx.Request("POST", "http://apiserver/items/1")) == 5.0
+    assert transport._timeout_for(httpx.Request("GET", "http://apiserver/items/1")) == 60.0
+    assert transport._timeout_for(httpx.Request("POST", "http://apiserver/other")) == 60.0
+
+
+def test_concurrent_tool_calls_are_limited():
+    inner = StubTransport(delay=0.01)
+    transport = make_transport(inner, {}, max_concurrency=2)
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://apiserver") as client:
+            return await asyncio.gather(*(client.get(f"/items/{i}") for i in range(8)))
+
+    responses = asyncio.run(run())
+
+    assert [response.json() for response in responses] == [{"ok": True}] * 8
+    assert inner.peak == 2
+
+
+@pytest.mark.parametrize(
+    "inner",
+    [StubTransport(delay=3600), StubTransport(stream=StalledStream())],
+    ids=["slow response", "stalled body"],
+)
+def test_tool_call_times_out(inner):
+    transport = make_transport(inner, {"update_item": 0.05})
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://apiserver") as client:
+            await client.post("/items/1")
+
+    with pytest.raises(httpx.ReadTimeout, match="timed out after 0.05s"):
+        asyncio.run(run())
+
+
+def test_transport_must_be_opened():
+    transport = ToolTimeoutTransport(StubTransport, make_app(), {}, 60.0, 10)
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://apiserver") as client:
+            await client.get("/items/1")
+
+    with pytest.raises(RuntimeError, match="before the app's lifespan"):
+        asyncio.run(run())
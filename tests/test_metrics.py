@@ -0,0 +1,108 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from qdrant_client import QdrantClient
+
+from app.clients.qdrant import InstrumentedQdrantClient
+from app.metrics import (
+    HTTP_REQUEST_DURATION,
+    QDRANT_REQUEST_DURATION,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsMiddleware,
+    render_metrics,
+)
+from app.routers import metrics
+
+
+@pytest.fixture
+def registry():
+    # Metrics created by a test are removed from the global registry afterwards
+    before = list(REGISTRY)
+    yield
+    REGISTRY[:] = before
+
+
+def sample_value(metric, sample_name: str) -> float | None:
+    for sample in metric.samples():
+        name, _, value = sample.rpartition(" ")
+        if name == sample_name:
+            return float(value)
+    return None
+
+
+def test_exposition_format(registry):
+    counter = Counter("test_requests_total", "Requests", ("path",))
+    counter.inc('/a"b\\c')
+    counter.inc('/a"b\\c', amount=2)
+    Gauge("test_in_flight", "In flight").dec()
+    histogram = Histogram("test_seconds", "Latency", ("op",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "read")
+    histogram.observe(0.5, "read")
+    histogram.observe(5.0, "read")
+
+    text = render_metrics()
+
+    assert text.endswith("\n")
+    assert (
+        "# HELP test_requests_total Requests\n"
+        "# TYPE test_requests_total counter\n"
+        'test_requests_total{path="/a\\"b\\\\c"} 3.0\n'
+    ) in text
+    assert "# TYPE test_in_flight gauge\ntest_in_flight -1.0\n" in text
+    assert (
+        "# TYPE test_seconds histogram\n"
+        'test_seconds_bucket{op="read",le="0.1"} 1\n'
+        'test_seconds_bucket{op="read",le="1.0"} 2\n'
+        'test_seconds_bucket{op="read",le="+Inf"} 3\n'
+        'test_seconds_sum{op="read"} 5.55\n'
+        'test_seconds_count{op="read"} 3\n'
+    ) in text
+
+
+def test_metric_without_labels_starts_at_zero(registry):
+    assert Counter("test_events_total", "Events").samples() == ["test_events_total 0.0"]
+    assert Counter("test_labeled_total", "Events", ("kind",)).samples() == []
+
+
+def test_middleware_labels_requests_by_route_and_operation_id():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+
+    @app.get("/items/{item_id}", operation_id="get_item")
+    def get_item(item_id: int):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    matched = 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",operation_id="get_item",status="200"}'
+    invalid = 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",operation_id="get_item",status="422"}'
+    unmatched = 'http_request_duration_seconds_count{method="GET",route="unmatched",operation_id="",status="404"}'
+    before = {name: sample_value(HTTP_REQUEST_DURATION, name) or 0 for name in (matched, invalid, unmatched)}
+
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/items/not-a-number")
+    client.get("/missing")
+
+    assert sample_value(HTTP_REQUEST_DURATION, matched) == before[matched] + 2
+    assert sample_value(HTTP_REQUEST_DURATION, invalid) == before[invalid] + 1
+    assert sample_value(HTTP_REQUEST_DURATION, unmatched) == before[unmatched] + 1
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert matched in response.text
+
+
+def test_instrumented_qdrant_client_times_calls_per_operation():
+    client = InstrumentedQdrantClient(QdrantClient(":memory:"))
+    name = 'qdrant_request_duration_seconds_count{operation="collection_exists"}'
+    before = sample_value(QDRANT_REQUEST_DURATION, name) or 0
+
+    assert client.collection_exists("missing") is False
+    assert client.collection_exists("missing") is False
+
+    assert sample_value(QDRANT_REQUEST_DURATION, name) == before + 2
+    # The wrapper is cached on the proxy after the first lookup
+    assert "collection_exists" in vars(client)
@@ -0,0 +1,62 @@
+import base64
+import datetime
+import uuid
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+import orjson
+import pytest
+from pydantic import BaseModel, TypeAdapter
+
+from app.responses import dumps
+
+
+class Item(BaseModel):
+    created_at: datetime.datetime
+    tags: set[str]
+    amount: Decimal | None = None
+
+
+VALUES = {
+    "utc datetime": datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.UTC),
+    "naive datetime": datetime.datetime(2024, 5, 1, 12, 30, 0, 123456),
+    "offset datetime": datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=9))),
+    "date": datetime.date(2024, 5, 1),
+    "time": datetime.time(12, 30, 1),
+    "uuid": uuid.UUID(int=5),
+    "decimal": Decimal("12345678901234567890.123456789"),
+    "decimal exponent": Decimal("1E+2"),
+    "non-string keys": {1: "a", 2: "b"},
+    "model": Item(created_at=datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC), tags={"x"}, amount=Decimal("1.10")),
+    "set": {3, 1, 2},
+    "frozenset": frozenset({"a"}),
+    "scalars": [1, 1.5, None, True, "日本語"],
+    "row": {"id": 1, "amount": Decimal("0.1"), "day": datetime.date(2024, 5, 1), "tags": ["a", "b"]},
+}
+
+
+@pytest.mark.parametrize("value", VALUES.values(), ids=VALUES.keys())
+def test_dumps_matches_pydantic_json_output(value):
+    assert orjson.loads(dumps(value)) == TypeAdapter(Any).dump_python(value, mode="json")
+
+
+def test_dumps_encodes_bytes_as_base64():
+    # Pydantic decodes bytes as UTF-8, which fails for binary BYTES values
+    with pytest.raises(UnicodeDecodeError):
+        TypeAdapter(Any).dump_python(b"\xff\x00", mode="json")
+
+    for value in (b"\xff\x00", bytearray(b"\xff\x00"), memoryview(b"\xff\x00")):
+        assert orjson.loads(dumps({"payload": value})) == {"payload": base64.b64encode(b"\xff\x00").decode()}
+
+
+def test_dumps_serializes_numpy_values():
+    assert orjson.loads(dumps({"vector": np.array([0.5, 1.0], dtype=np.float32), "n": np.int64(3)})) == {
+        "vector": [0.5, 1.0],
+        "n": 3,
+    }
+
+
+def test_dumps_rejects_unsupported_types():
+    with pytest.raises(TypeError, match="not JSON serializable"):
+        dumps({"value": object()})
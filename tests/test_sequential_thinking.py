@@ -0,0 +1,63 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.clients.thought_store import LogThoughtStore
+from app.routers import sequential_thinking
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = FastAPI()
+    app.include_router(sequential_thinking.router, prefix="/sequential-thinking")
+    app.state.thought_store = LogThoughtStore(str(tmp_path / "thoughts.log"))
+    return TestClient(app)
+
+
+def add_thought(client: TestClient, session_id: str, thought_number: int, **fields) -> dict:
+    thought = {
+        "thought": f"Thought {thought_number}",
+        "thought_number": thought_number,
+        "total_thoughts": 3,
+        "next_thought_needed": True,
+        **fields,
+    }
+    response = client.post(
+        "/sequential-thinking/sequential-thinking", json=thought, headers={"X-Session-ID": session_id}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_thoughts_history_branches_and_metadata(client):
+    first = add_thought(client, "a", 1)
+    branched = add_thought(client, "a", 2, branch_from_thought=1, branch_id="alt")
+    last = add_thought(client, "a", 4)
+    add_thought(client, "b", 1)
+
+    assert branched["branches"] == ["alt"]
+    assert (last["total_thoughts"], last["thought_history_length"]) == (4, 3)
+
+    headers = {"X-Session-ID": "a"}
+    history = client.get("/sequential-thinking/history", params={"since_id": first["thought_id"]}, headers=headers)
+    assert [thought["id"] for thought in history.json()] == [branched["thought_id"], last["thought_id"]]
+    branch = client.get("/sequential-thinking/branch/alt", headers=headers)
+    assert branch.json() == {"id": "alt", "thoughts": [branched["thought_id"]]}
+    metadata = client.get("/sequential-thinking/metadata", headers=headers).json()
+    assert (metadata["total_thoughts"], metadata["total_branches"]) == (3, 1)
+
+
+def test_errors(client):
+    response = client.post(
+        "/sequential-thinking/sequential-thinking",
+        json={
+            "thought": "x",
+            "thought_number": 1,
+            "total_thoughts": 1,
+            "next_thought_needed": False,
+            "is_revision": True,
+        },
+    )
+    assert response.status_code == 400
+    assert client.get("/sequential-thinking/history", params={"since_id": "missing"}).status_code == 404
+    assert client.get("/sequential-thinking/branch/missing").status_code == 404
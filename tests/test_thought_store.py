@@ -0,0 +1,130 @@
+import itertools
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.clients.thought_store import InMemoryThoughtStore, LogThoughtStore, SQLiteThoughtStore, ThoughtRecord
+
+_ids = itertools.count()
+
+
+def make_record(
+    thought_number: int = 1, branch_id: str | None = None, timestamp: datetime | None = None
+) -> ThoughtRecord:
+    return ThoughtRecord(
+        id=f"thought-{next(_ids)}",
+        thought=f"Thought {thought_number}",
+        thought_number=thought_number,
+        total_thoughts=5,
+        next_thought_needed=True,
+        is_revision=None,
+        revises_thought=None,
+        branch_from_thought=1 if branch_id else None,
+        branch_id=branch_id,
+        needs_more_thoughts=None,
+        timestamp=timestamp or datetime.now(),
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite", "log"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = InMemoryThoughtStore(max_thoughts_per_session=3)
+    elif request.param == "sqlite":
+        store = SQLiteThoughtStore(str(tmp_path / "thoughts.sqlite3"), max_thoughts_per_session=3)
+    else:
+        store = LogThoughtStore(str(tmp_path / "thoughts.log"), max_thoughts_per_session=3)
+    yield store
+    store.close()
+
+
+def test_sessions_are_isolated(store):
+    store.add_thought("a", make_record(1))
+    store.add_thought("a", make_record(2, branch_id="alt"))
+
+    assert store.add_thought("b", make_record(1)) == ([], 1)
+    assert store.get_metadata("a") == {
+        "total_thoughts": 2,
+        "total_branches": 1,
+        "branches": [{"id": "alt", "thought_count": 1}],
+    }
+    assert store.get_metadata("missing") == {"total_thoughts": 0, "total_branches": 0, "branches": []}
+
+
+def test_seq_orders_the_thoughts_of_each_session(store):
+    for number in range(1, 4):
+        store.add_thought("a", make_record(number))
+        store.add_thought("b", make_record(number))
+
+    for session_id in ("a", "b"):
+        history = store.get_history(session_id)
+        assert [record.thought_number for record in history] == [1, 2, 3]
+        assert [record.seq for record in history] == sorted({record.seq for record in history})
+
+
+def test_history_pages_and_keeps_the_newest_thoughts(store):
+    records = [make_record(number) for number in range(1, 6)]
+    for record in records:
+        store.add_thought("s", record)
+
+    history = store.get_history("s")
+
+    assert [record.id for record in history] == [record.id for record in records[2:]]
+    assert [record.id for record in store.get_history("s", since_id=records[2].id, limit=1)] == [records[3].id]
+    assert [record.id for record in store.get_history("s", thought_number=4)] == [records[3].id]
+    with pytest.raises(KeyError):
+        store.get_history("s", since_id=records[0].id)
+
+
+def test_branches(store):
+    first = make_record(2, branch_id="alt")
+    second = make_record(3, branch_id="alt")
+    store.add_thought("s", make_record(1))
+    store.add_thought("s", first)
+    branches, count = store.add_thought("s", second)
+
+    assert (branches, count) == (["alt"], 3)
+    assert store.get_branch("s", "alt") == [first.id, second.id]
+    assert store.get_branch("s", "missing") is None
+    assert store.get_branch("other", "alt") is None
+
+
+def test_log_store_replays_the_log_in_other_processes(tmp_path):
+    path = str(tmp_path / "thoughts.log")
+    writer, reader = LogThoughtStore(path), LogThoughtStore(path)
+    record = make_record(1, branch_id="alt")
+
+    writer.add_thought("s", record)
+
+    assert [stored.id for stored in reader.get_history("s")] == [record.id]
+    assert reader.get_branch("s", "alt") == [record.id]
+
+
+def log_lines(store: LogThoughtStore) -> int:
+    return len(store.path.read_bytes().splitlines())
+
+
+def test_log_store_evicts_sessions_beyond_max_sessions(tmp_path):
+    store = LogThoughtStore(str(tmp_path / "thoughts.log"), max_sessions=10)
+
+    for i in range(100):
+        store.add_thought(f"s{i}", make_record())
+
+    assert store._replica.session_count() <= 10
+    assert log_lines(store) <= 10
+    assert store.get_metadata("s0")["total_thoughts"] == 0
+    assert store.get_metadata("s99")["total_thoughts"] == 1
+
+
+def test_log_store_evicts_expired_sessions(tmp_path):
+    store = LogThoughtStore(str(tmp_path / "thoughts.log"), max_sessions=10000, session_ttl=1)
+    expired = datetime.now() - timedelta(hours=5)
+    for i in range(3000):
+        store.add_thought(f"old{i}", make_record(timestamp=expired))
+    store._next_expiry = 0.0
+    store.add_thought("fresh", make_record())
+
+    assert store._replica.session_count() == 1
+    assert log_lines(store) == 1
+    assert store.get_metadata("old0")["total_thoughts"] == 0
+    assert store.get_metadata("fresh")["total_thoughts"] == 1
@@ -0,0 +1,49 @@
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.tracing import TracingMiddleware, save_profile, span
+
+
+def test_save_profile_deletes_the_oldest_profiles(tmp_path):
+    for i in range(5):
+        old_profile = tmp_path / f"old-{i}.folded"
+        old_profile.write_text("main 1\n")
+        os.utime(old_profile, (1_000_000 + i, 1_000_000 + i))
+
+    profile_id = save_profile("main;handler 3\n", "search", directory=str(tmp_path), max_files=3)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(["old-3.folded", "old-4.folded", profile_id])
+    assert (tmp_path / profile_id).read_text() == "main;handler 3\n"
+
+
+def make_client(**options) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware, **options)
+
+    @app.get("/work")
+    def work():
+        with span("stage"):
+            return {"status": "ok"}
+
+    return TestClient(app)
+
+
+def test_tracing_adds_server_timing():
+    response = make_client(tracing_enabled=True, profiling_enabled=False, sample_rate=0.0).get("/work")
+
+    assert response.headers["server-timing"].startswith("stage;dur=")
+    assert "x-profile-id" not in response.headers
+
+
+def test_sampling_requires_profiling_enabled(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    disabled = make_client(tracing_enabled=False, profiling_enabled=False, sample_rate=1.0)
+    assert "x-profile-id" not in disabled.get("/work", headers={"X-Profile": "1"}).headers
+    assert not (tmp_path / "data").exists()
+
+    enabled = make_client(tracing_enabled=False, profiling_enabled=True, sample_rate=1.0)
+    profile_id = enabled.get("/work").headers["x-profile-id"]
+    assert (tmp_path / "data" / "profiles" / profile_id).is_file()
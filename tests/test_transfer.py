@@ -0,0 +1,159 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from app.routers.knowledge_base import transfer
+
+POINTS = [
+    SimpleNamespace(id=1, payload={"text": "BigQuery", "metadata": {"source": "docs"}}, vector=[0.5, -1.25, 2.0, 0.0]),
+    SimpleNamespace(
+        id=2, payload={"text": "日本語のテキスト\nwith a newline", "metadata": {}}, vector=[1.0, 1.0, 1.0, 1.0]
+    ),
+    SimpleNamespace(id=3, payload={}, vector=[-0.125, 0.25, -0.5, 4.0]),
+]
+
+
+def encode(format: str, points: list = POINTS) -> bytes:
+    if format == "ndjson":
+        return transfer._encode_ndjson(points)
+    return transfer.BINARY_MAGIC + transfer._encode_binary(points)
+
+
+def parse(format: str, data: bytes, chunk_size: int = 1) -> list[dict]:
+    parser = transfer._iter_ndjson_records if format == "ndjson" else transfer._iter_binary_records
+
+    async def stream():
+        for start in range(0, len(data), chunk_size):
+            yield data[start : start + chunk_size]
+
+    async def collect():
+        return [record async for record in parser(stream())]
+
+    return asyncio.run(collect())
+
+
+def as_records(points: list) -> list[dict]:
+    return [{"id": point.id, "payload": point.payload, "vector": point.vector} for point in points]
+
+
+@pytest.mark.parametrize("format", ["ndjson", "binary"])
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 20])
+def test_parsers_round_trip_across_chunk_boundaries(format, chunk_size):
+    assert parse(format, encode(format), chunk_size) == as_records(POINTS)
+
+
+def test_ndjson_parser_accepts_missing_trailing_newline_and_blank_lines():
+    data = b"\n" + encode("ndjson").rstrip(b"\n")
+
+    assert parse("ndjson", data) == as_records(POINTS)
+
+
+@pytest.mark.parametrize("format", ["ndjson", "binary"])
+def test_parsers_accept_empty_input(format):
+    assert parse(format, b"") == []
+
+
+def test_binary_parser_rejects_missing_header():
+    with pytest.raises(ValueError, match="missing header"):
+        parse("binary", transfer._encode_binary(POINTS))
+
+
+@pytest.mark.parametrize(
+    "cut",
+    [
+        2,  # inside the magic header
+        len(transfer.BINARY_MAGIC) + 5,  # inside the record header
+        len(transfer.BINARY_MAGIC) + transfer.RECORD_HEADER.size + 3,  # inside the metadata
+        -1,  # inside the last vector
+    ],
+)
+def test_binary_parser_rejects_truncated_record(cut):
+    with pytest.raises(ValueError, match="truncated"):
+        parse("binary", encode("binary")[:cut])
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(transfer.router, prefix="/knowledge-base")
+    app.state.qdrant_client = QdrantClient(":memory:")
+    app.state.qdrant_client.create_collection(
+        "source", vectors_config=models.VectorParams(size=4, distance=models.Distance.DOT)
+    )
+    app.state.qdrant_client.upsert(
+        "source",
+        points=[
+            models.PointStruct(id=i, vector=[float(i), 1.0, -float(i % 7), 0.5], payload={"text": f"document {i}"})
+            for i in range(1, 501)
+        ],
+    )
+    return TestClient(app)
+
+
+def sorted_points(qdrant: QdrantClient, collection_name: str) -> list:
+    points, _ = qdrant.scroll(collection_name, limit=1000, with_payload=True, with_vectors=True)
+    return sorted(points, key=lambda point: point.id)
+
+
+@pytest.mark.parametrize("format", ["ndjson", "binary"])
+def test_export_import_round_trip(client, format):
+    exported = client.get(f"/knowledge-base/collections/source/export?format={format}&batch_size=64")
+    assert exported.status_code == 200
+    assert exported.headers["content-type"] == transfer.MEDIA_TYPES[format]
+
+    body = exported.content
+    chunks = (body[start : start + 777] for start in range(0, len(body), 777))
+    imported = client.post(f"/knowledge-base/collections/target/import?format={format}&batch_size=100", content=chunks)
+
+    assert imported.status_code == 200
+    assert imported.json()["imported"] == 500
+    qdrant = client.app.state.qdrant_client
+    assert qdrant.get_collection("target").config.params.vectors == models.VectorParams(
+        size=4, distance=models.Distance.DOT
+    )
+    source, target = sorted_points(qdrant, "source"), sorted_points(qdrant, "target")
+    assert [(point.id, point.payload) for point in target] == [(point.id, point.payload) for point in source]
+    np.testing.assert_allclose([point.vector for point in target], [point.vector for point in source], rtol=1e-6)
+
+
+def with_header(format: str, body: bytes, header: dict | None = None) -> bytes:
+    header = header or {"collection": {"size": 4, "distance": "Cosine"}}
+    encoded = transfer._encode_header(format, header)
+    # The binary body already starts with the magic, which the encoded header repeats
+    return encoded + (body[len(transfer.BINARY_MAGIC) :] if format == "binary" else body)
+
+
+NDJSON_HEADER = b'{"collection": {"size": 4, "distance": "Cosine"}}\n'
+
+
+@pytest.mark.parametrize(
+    ("format", "body"),
+    [
+        ("binary", with_header("binary", encode("binary"))[:-3]),
+        ("binary", b"QKB1\x01"),
+        ("binary", b"not a binary export"),
+        ("binary", encode("binary")),  # no collection header
+        ("binary", with_header("binary", encode("binary"), {"collection": {"size": 4, "distance": "Manhattan?"}})),
+        ("ndjson", with_header("ndjson", encode("ndjson"))[:-20]),
+        ("ndjson", encode("ndjson")),  # no collection header
+        ("ndjson", NDJSON_HEADER + b'{"payload": {}, "vector": [0, 0, 0, 1]}\n'),  # no id
+        ("ndjson", NDJSON_HEADER + b'{"id": 1, "payload": {}}\n'),  # no vector
+        ("ndjson", NDJSON_HEADER + b'{"id": 1.5, "vector": [0, 0, 0, 1]}\n'),  # invalid id
+        ("ndjson", NDJSON_HEADER + b'{"id": 1, "vector": [0, 1]}\n'),  # wrong dimension
+        ("ndjson", NDJSON_HEADER + b"[1, 2]\n"),
+    ],
+)
+def test_import_of_invalid_input_returns_400(client, format, body):
+    response = client.post(f"/knowledge-base/collections/target/import?format={format}", content=body)
+
+    assert response.status_code == 400, response.text
+
+
+def test_export_of_missing_collection_returns_404(client):
+    assert client.get("/knowledge-base/collections/missing/export").status_code == 404